@@ -0,0 +1,269 @@
+from functools import wraps
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask_login import login_required, current_user
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from models import db, User, Category, Recipe, Comment, Page
+from deletion import delete_recipe as remove_recipe, delete_user as remove_user
+from routing import slugify
+
+bp = Blueprint('admin', __name__, url_prefix='/admin')
+
+# ============= ADMIN ROUTES =============
+
+def admin_required(f):
+    """Admin kontrolü decorator"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated or not current_user.is_admin:
+            flash('Bu sayfaya erişim yetkiniz yok.', 'danger')
+            return redirect(url_for('main.index'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+@bp.route('')
+@login_required
+@admin_required
+def dashboard():
+    """Admin panel ana sayfa"""
+    stats = {
+        'users': User.query.filter(User.deleted_at.is_(None)).count(),
+        'recipes': Recipe.query.count(),
+        'categories': Category.query.count(),
+        'comments': Comment.query.count()
+    }
+    return render_template('admin/dashboard.html', stats=stats)
+
+# ============= ADMIN - RECIPES =============
+
+@bp.route('/recipes')
+@login_required
+@admin_required
+def recipes():
+    """Admin - Tarifler listesi"""
+    recipes = Recipe.query.options(joinedload(Recipe.category), joinedload(Recipe.author)) \
+        .order_by(Recipe.created_at.desc()).all()
+    return render_template('admin/recipes.html', recipes=recipes)
+
+@bp.route('/recipes/<int:recipe_id>/delete', methods=['POST'])
+@login_required
+@admin_required
+def delete_recipe(recipe_id):
+    """Admin - Tarif silme"""
+    recipe = Recipe.query.get_or_404(recipe_id)
+    remove_recipe(recipe)
+    flash('Tarif silindi.', 'success')
+    return redirect(url_for('admin.recipes'))
+
+# ============= ADMIN - CATEGORIES =============
+
+@bp.route('/categories')
+@login_required
+@admin_required
+def categories():
+    """Admin - Kategoriler listesi"""
+    categories = Category.query.all()
+    recipe_counts = dict(db.session.query(Recipe.category_id, func.count(Recipe.id)).group_by(Recipe.category_id))
+    return render_template('admin/categories.html', categories=categories, recipe_counts=recipe_counts)
+
+@bp.route('/categories/add', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def add_category():
+    """Admin - Kategori ekleme"""
+    if request.method == 'POST':
+        name = request.form.get('name')
+        # "Çorbalar", "çorbalar" ve "corbalar" aynı slug'a iner
+        slug = slugify(request.form.get('slug') or name)
+        description = request.form.get('description')
+        
+        if not name or not slug:
+            flash('İsim ve slug gerekli.', 'danger')
+            return redirect(url_for('admin.add_category'))
+        
+        if Category.query.filter_by(slug=slug).first():
+            flash('Bu slug zaten kullanılıyor.', 'danger')
+            return redirect(url_for('admin.add_category'))
+        
+        category = Category(name=name, slug=slug, description=description)
+        db.session.add(category)
+        db.session.commit()
+        
+        flash('Kategori eklendi!', 'success')
+        return redirect(url_for('admin.categories'))
+    
+    return render_template('admin/add_category.html')
+
+@bp.route('/categories/<int:category_id>/edit', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def edit_category(category_id):
+    """Admin - Kategori düzenleme"""
+    category = Category.query.get_or_404(category_id)
+    
+    if request.method == 'POST':
+        slug = slugify(request.form.get('slug') or request.form.get('name'))
+        if not slug or Category.query.filter(Category.slug == slug, Category.id != category.id).first():
+            flash('Bu slug geçersiz veya zaten kullanılıyor.', 'danger')
+            return redirect(url_for('admin.edit_category', category_id=category.id))
+        
+        category.name = request.form.get('name')
+        category.slug = slug
+        category.description = request.form.get('description')
+        
+        db.session.commit()
+        flash('Kategori güncellendi!', 'success')
+        return redirect(url_for('admin.categories'))
+    
+    return render_template('admin/edit_category.html', category=category)
+
+@bp.route('/categories/<int:category_id>/delete', methods=['POST'])
+@login_required
+@admin_required
+def delete_category(category_id):
+    """Admin - Kategori silme"""
+    category = Category.query.get_or_404(category_id)
+    
+    if db.session.query(Recipe.id).filter_by(category_id=category.id).first():
+        flash('Bu kategoriye ait tarifler var, önce onları silin veya taşıyın.', 'danger')
+        return redirect(url_for('admin.categories'))
+    
+    db.session.delete(category)
+    db.session.commit()
+    flash('Kategori silindi.', 'success')
+    return redirect(url_for('admin.categories'))
+
+# ============= ADMIN - USERS =============
+
+@bp.route('/users')
+@login_required
+@admin_required
+def users():
+    """Admin - Kullanıcılar listesi"""
+    users = User.query.filter(User.deleted_at.is_(None)).all()
+    # Sayılar koleksiyonları yüklemeden, tek GROUP BY ile
+    recipe_counts = dict(db.session.query(Recipe.user_id, func.count(Recipe.id)).group_by(Recipe.user_id))
+    comment_counts = dict(db.session.query(Comment.user_id, func.count(Comment.id)).group_by(Comment.user_id))
+    return render_template('admin/users.html', users=users,
+                           recipe_counts=recipe_counts, comment_counts=comment_counts)
+
+@bp.route('/users/<int:user_id>/toggle-admin', methods=['POST'])
+@login_required
+@admin_required
+def toggle_user_admin(user_id):
+    """Admin - Kullanıcı admin durumunu değiştir"""
+    user = User.query.get_or_404(user_id)
+    
+    if user.id == current_user.id:
+        flash('Kendi admin durumunuzu değiştiremezsiniz.', 'danger')
+        return redirect(url_for('admin.users'))
+    
+    user.is_admin = not user.is_admin
+    db.session.commit()
+    flash(f"Kullanıcı {'admin yapıldı' if user.is_admin else 'admin değil'}", 'success')
+    return redirect(url_for('admin.users'))
+
+@bp.route('/users/<int:user_id>/delete', methods=['POST'])
+@login_required
+@admin_required
+def delete_user(user_id):
+    """Admin - Kullanıcı silme"""
+    user = User.query.get_or_404(user_id)
+    
+    if user.id == current_user.id:
+        flash('Kendi hesabınızı silemezsiniz.', 'danger')
+        return redirect(url_for('admin.users'))
+    
+    if remove_user(user):
+        flash('Kullanıcı silindi.', 'success')
+    else:
+        flash('Kullanıcı devre dışı bırakıldı; tarifleri ve yorumları arka planda siliniyor.', 'info')
+    return redirect(url_for('admin.users'))
+
+# ============= ADMIN - COMMENTS =============
+
+@bp.route('/comments')
+@login_required
+@admin_required
+def comments():
+    """Admin - Yorumlar listesi"""
+    comments = Comment.query.options(joinedload(Comment.user), joinedload(Comment.recipe)) \
+        .order_by(Comment.created_at.desc()).all()
+    return render_template('admin/comments.html', comments=comments)
+
+@bp.route('/comments/<int:comment_id>/delete', methods=['POST'])
+@login_required
+@admin_required
+def delete_comment(comment_id):
+    """Admin - Yorum silme"""
+    comment = Comment.query.get_or_404(comment_id)
+    db.session.delete(comment)
+    db.session.commit()
+    flash('Yorum silindi.', 'success')
+    return redirect(url_for('admin.comments'))
+
+# ============= ADMIN - PAGES =============
+
+@bp.route('/pages')
+@login_required
+@admin_required
+def pages():
+    """Admin - Sayfalar listesi"""
+    pages = Page.query.all()
+    return render_template('admin/pages.html', pages=pages)
+
+@bp.route('/pages/add', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def add_page():
+    """Admin - Sayfa ekleme"""
+    if request.method == 'POST':
+        slug = request.form.get('slug')
+        title = request.form.get('title')
+        content = request.form.get('content')
+        
+        if not slug or not title:
+            flash('Slug ve başlık gerekli.', 'danger')
+            return redirect(url_for('admin.add_page'))
+        
+        if Page.query.filter_by(slug=slug).first():
+            flash('Bu slug zaten kullanılıyor.', 'danger')
+            return redirect(url_for('admin.add_page'))
+        
+        page = Page(slug=slug, title=title, content=content)
+        db.session.add(page)
+        db.session.commit()
+        
+        flash('Sayfa eklendi!', 'success')
+        return redirect(url_for('admin.pages'))
+    
+    return render_template('admin/add_page.html')
+
+@bp.route('/pages/<int:page_id>/edit', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def edit_page(page_id):
+    """Admin - Sayfa düzenleme"""
+    page = Page.query.get_or_404(page_id)
+    
+    if request.method == 'POST':
+        page.slug = request.form.get('slug')
+        page.title = request.form.get('title')
+        page.content = request.form.get('content')
+        
+        db.session.commit()
+        flash('Sayfa güncellendi!', 'success')
+        return redirect(url_for('admin.pages'))
+    
+    return render_template('admin/edit_page.html', page=page)
+
+@bp.route('/pages/<int:page_id>/delete', methods=['POST'])
+@login_required
+@admin_required
+def delete_page(page_id):
+    """Admin - Sayfa silme"""
+    page = Page.query.get_or_404(page_id)
+    db.session.delete(page)
+    db.session.commit()
+    flash('Sayfa silindi.', 'success')
+    return redirect(url_for('admin.pages'))
@@ -1,75 +1,301 @@
 import os
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+import base64
+import json
+import queue
+import time
+import click
+from flask import Flask, Blueprint, Response, abort, current_app, render_template, request, redirect, url_for, flash, jsonify
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload, selectinload
+from flask.cli import with_appcontext
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
-from models import db, User, Category, Recipe, Comment, Page, Image
+from models import db, User, Category, Recipe, Comment, Page, Image, recount_comment_stats
+from compression import CompressionMiddleware
+from ratelimit import RateLimiter
+from images import save_upload, make_placeholder, remove_uploads
+from deletion import delete_recipe as remove_recipe, purge_deleted_users
+from feeds import FeedWriter
+from prerender import PageRenderer
+from routing import SlugRouter, slugify
+from schema import upgrade_schema
+from events import EventBroker
 from datetime import datetime
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__)
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///nefisyemekler.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['UPLOAD_FOLDER'] = 'static/uploads'
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
-app.config['ALLOWED_EXTENSIONS'] = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
-
-# Initialize extensions
-db.init_app(app)
 login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = 'login'
+login_manager.login_view = 'main.login'
 login_manager.login_message = 'Lütfen giriş yapın.'
+limiter = RateLimiter()
+broker = EventBroker()
+feeds = FeedWriter()
+prerender = PageRenderer()
+router = SlugRouter()
+
+main = Blueprint('main', __name__)
+
+def create_app(test_config=None):
+    """Application factory.
+
+    Import sırasında hiçbir şey kurulmaz ve veritabanına bağlanılmaz;
+    gunicorn `preload_app` ile master süreçte güvenle çağrılabilir.
+    Şema oluşturma `flask init-db` komutundadır, açılış yolunda değildir.
+    """
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///nefisyemekler.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['DB_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', 5))
+    app.config['DB_MAX_OVERFLOW'] = int(os.getenv('DB_MAX_OVERFLOW', 2))
+    app.config['DB_POOL_TIMEOUT'] = int(os.getenv('DB_POOL_TIMEOUT', 10))  # saniye
+    app.config['UPLOAD_FOLDER'] = 'static/uploads'
+    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+    app.config['ALLOWED_EXTENSIONS'] = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+    app.config['ADMIN_ENABLED'] = os.getenv('ADMIN_ENABLED', '1') == '1'
+    # None: Flask'ın varsayılanı, sadece debug modunda (`flask run --debug`) açık.
+    # Production'da gunicorn.conf.py 0 verir, template'ler her istekte stat edilmez.
+    templates_auto_reload = os.getenv('TEMPLATES_AUTO_RELOAD')
+    app.config['TEMPLATES_AUTO_RELOAD'] = None if templates_auto_reload is None else templates_auto_reload == '1'
+    app.config['JINJA_BYTECODE_CACHE_DIR'] = os.getenv(
+        'JINJA_BYTECODE_CACHE_DIR', os.path.join(app.root_path, '.jinja_cache'))
+    app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 500))  # byte
+    app.config['COMPRESS_LEVEL'] = int(os.getenv('COMPRESS_LEVEL', 6))
+    app.config['COMPRESS_BROTLI_QUALITY'] = int(os.getenv('COMPRESS_BROTLI_QUALITY', 5))
+    app.config['COMPRESS_STREAM_THRESHOLD'] = int(os.getenv('COMPRESS_STREAM_THRESHOLD', 256 * 1024))
+    app.config['COMPRESS_CACHE_SIZE'] = int(os.getenv('COMPRESS_CACHE_SIZE', 256))
+    app.config['RATELIMIT_ENABLED'] = os.getenv('RATELIMIT_ENABLED', '1') == '1'
+    # memory:// worker başınadır; worker'lar arası paylaşım için sqlite:/// veya redis://
+    app.config['RATELIMIT_STORAGE_URL'] = os.getenv('RATELIMIT_STORAGE_URL', 'memory://')
+    # Önündeki reverse proxy sayısı (Render, nginx: 1). 0 iken X-Forwarded-For yok sayılır;
+    # aksi halde rate limit tüm ziyaretçileri proxy'nin tek IP'si olarak görür.
+    app.config['TRUSTED_PROXY_COUNT'] = int(os.getenv('TRUSTED_PROXY_COUNT', 0))
+    app.config['COMMENTS_PER_PAGE'] = int(os.getenv('COMMENTS_PER_PAGE', 20))
+    app.config['SSE_MAX_DURATION'] = int(os.getenv('SSE_MAX_DURATION', 300))  # saniye, sonra istemci yeniden bağlanır
+    app.config['SSE_HEARTBEAT'] = int(os.getenv('SSE_HEARTBEAT', 15))  # saniye
+    # Her açık akış bir thread'i SSE_MAX_DURATION boyunca tutar; worker başına üst sınır.
+    # Dolunca 204 döner (istemci canlı yorumsuz devam eder), 0 akışı kapatır.
+    # gunicorn.conf.py worker tipine göre ayarlar (sync: 0).
+    app.config['SSE_MAX_STREAMS'] = int(os.getenv('SSE_MAX_STREAMS', 10))
+    # Canlı yorum olaylarının worker'lar arası dağıtıldığı soketlerin klasörü
+    app.config['EVENTS_FANOUT_DIR'] = os.getenv('EVENTS_FANOUT_DIR', os.path.join(app.instance_path, 'events'))
+    # Bu kadar tarif + yorumdan büyük hesaplar arka planda parça parça silinir
+    app.config['USER_DELETE_SYNC_LIMIT'] = int(os.getenv('USER_DELETE_SYNC_LIMIT', 1000))
+    app.config['USER_DELETE_BATCH_SIZE'] = int(os.getenv('USER_DELETE_BATCH_SIZE', 500))
+    # Sitemap ve RSS/Atom dosyalarındaki mutlak URL'lerin kökü
+    app.config['SITE_URL'] = os.getenv('SITE_URL', 'http://localhost:5000')
+    app.config['FEEDS_FOLDER'] = os.getenv('FEEDS_FOLDER', os.path.join(app.instance_path, 'feeds'))
+    # Hakkımızda/İletişim gibi sayfalar anonim ziyaretçilere önceden render edilmiş dosyadan sunulur
+    app.config['PRERENDER_ENABLED'] = os.getenv('PRERENDER_ENABLED', '1') == '1'
+    app.config['PRERENDER_FOLDER'] = os.getenv('PRERENDER_FOLDER', os.path.join(app.instance_path, 'pages'))
+    # Slug tablosu değiştiğinde worker'lara haber veren sürüm dosyası
+    app.config['ROUTING_VERSION_FILE'] = os.getenv(
+        'ROUTING_VERSION_FILE', os.path.join(app.instance_path, 'routing.version'))
+    if test_config:
+        app.config.update(test_config)
+
+    # Bağlantı havuzu gunicorn worker/thread sayısına göre (gunicorn.conf.py)
+    database_uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if database_uri not in ('sqlite://', 'sqlite:///:memory:'):
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {
+            'pool_size': app.config['DB_POOL_SIZE'],
+            'max_overflow': app.config['DB_MAX_OVERFLOW'],
+            'pool_timeout': app.config['DB_POOL_TIMEOUT'],
+        })
+        if database_uri.startswith('sqlite'):
+            # Eşzamanlı yazmalarda "database is locked" yerine kilidi bekle
+            app.config['SQLALCHEMY_ENGINE_OPTIONS'].setdefault('connect_args', {'timeout': 15})
+
+    # Derlenmiş template'ler worker'lar ve yeniden başlatmalar arasında paylaşılır
+    if app.config['JINJA_BYTECODE_CACHE_DIR']:
+        os.makedirs(app.config['JINJA_BYTECODE_CACHE_DIR'], exist_ok=True)
+        app.jinja_options = dict(
+            app.jinja_options,
+            bytecode_cache=FileSystemBytecodeCache(app.config['JINJA_BYTECODE_CACHE_DIR']),
+        )
+
+    # Initialize extensions
+    db.init_app(app)
+    login_manager.init_app(app)
+    limiter.init_app(app)
+    broker.init_app(app)
+    feeds.init_app(app)
+    prerender.init_app(app)
+    router.init_app(app)
+    if app.config['TRUSTED_PROXY_COUNT']:
+        # Sadece güvenilen proxy'lerin eklediği X-Forwarded-For/Proto değerleri kullanılır
+        count = app.config['TRUSTED_PROXY_COUNT']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=count, x_proto=count)
+    app.wsgi_app = CompressionMiddleware(
+        app.wsgi_app,
+        min_size=app.config['COMPRESS_MIN_SIZE'],
+        level=app.config['COMPRESS_LEVEL'],
+        brotli_quality=app.config['COMPRESS_BROTLI_QUALITY'],
+        stream_threshold=app.config['COMPRESS_STREAM_THRESHOLD'],
+        cache_size=app.config['COMPRESS_CACHE_SIZE'],
+    )
+
+    app.register_blueprint(main)
+    if app.config['ADMIN_ENABLED']:
+        # Admin modülü sadece gerektiğinde import edilir
+        from admin import bp as admin_bp
+        app.register_blueprint(admin_bp)
+
+    app.cli.add_command(init_db)
+    app.cli.add_command(compile_templates)
+    app.cli.add_command(recount_comments)
+    app.cli.add_command(purge_deleted_users_command)
+    app.cli.add_command(generate_feeds)
+    app.cli.add_command(prerender_pages)
+    return app
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user = User.query.get(int(user_id))
+    # Silinmeyi bekleyen hesabın açık oturumları da geçersiz
+    return user if user is not None and user.is_active else None
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
+
+def gallery_images(start_position=0):
+    """Formdaki galeri dosyalarını kaydet, eklenecek Image nesnelerini döndür"""
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    images = []
+    for file in request.files.getlist('images'):
+        if file and file.filename and allowed_file(file.filename):
+            filename = save_upload(file, upload_folder, unique=True)
+            preview = make_placeholder(os.path.join(upload_folder, filename))
+            if preview is None:
+                continue  # geçersiz görsel, dosya silindi
+            placeholder, width, height = preview
+            images.append(Image(
+                filename=filename,
+                position=start_position + len(images),
+                placeholder=placeholder,
+                width=width,
+                height=height
+            ))
+    return images
+
+def render_comment(comment):
+    """Tek yorum parçasını render et (context processor'ları çalıştırmadan)"""
+    return current_app.jinja_env.get_template('_comment.html').render(comment=comment)
+
+def encode_cursor(comment):
+    """Sayfalama cursor'ı: son yorumun (created_at, id) değeri"""
+    raw = f'{comment.created_at.isoformat()}|{comment.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor):
+    try:
+        created_at, comment_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(comment_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+def comment_page(recipe_id, cursor=None):
+    """Bir sayfa yorum ve sonraki sayfanın cursor'ını döndür (yoksa None)"""
+    per_page = current_app.config['COMMENTS_PER_PAGE']
+    query = Comment.query.options(joinedload(Comment.user)).filter(Comment.recipe_id == recipe_id)
+    if cursor:
+        created_at, comment_id = cursor
+        query = query.filter(or_(
+            Comment.created_at < created_at,
+            and_(Comment.created_at == created_at, Comment.id < comment_id)
+        ))
+    comments = query.order_by(Comment.created_at.desc(), Comment.id.desc()).limit(per_page + 1).all()
+    if len(comments) > per_page:
+        comments = comments[:per_page]
+        return comments, encode_cursor(comments[-1])
+    return comments, None
+
+def canonical_redirect(endpoint, slug, resolve):
+    """'Çorbalar' gibi normalize edilmemiş slug'ı kanonik adrese 301 ile yönlendir, yoksa 404"""
+    canonical = slugify(slug)
+    if canonical != slug and resolve(canonical) is not None:
+        return redirect(url_for(endpoint, slug=canonical), 301)
+    abort(404)
 
 # ============= PUBLIC ROUTES =============
 
-@app.route('/')
+@main.route('/')
 def index():
     """Ana sayfa - En yeni tarifler"""
-    recipes = Recipe.query.order_by(Recipe.created_at.desc()).limit(12).all()
+    recipes = Recipe.query.options(selectinload(Recipe.cover_image)) \
+        .order_by(Recipe.created_at.desc()).limit(12).all()
     categories = Category.query.all()
     return render_template('index.html', recipes=recipes, categories=categories)
 
-@app.route('/category/<slug>')
+@main.route('/category/<slug>')
 def category(slug):
     """Kategori sayfası"""
-    category = Category.query.filter_by(slug=slug).first_or_404()
-    recipes = Recipe.query.filter_by(category_id=category.id).order_by(Recipe.created_at.desc()).all()
+    category_id = router.category_id(slug)
+    if category_id is None:
+        return canonical_redirect('main.category', slug, router.category_id)
     categories = Category.query.all()
+    category = next((c for c in categories if c.id == category_id), None)
+    if category is None:
+        abort(404)
+    recipes = Recipe.query.options(selectinload(Recipe.cover_image)) \
+        .filter_by(category_id=category.id).order_by(Recipe.created_at.desc()).all()
     return render_template('category.html', category=category, recipes=recipes, categories=categories)
 
-@app.route('/recipe/<int:recipe_id>')
-def recipe_detail(recipe_id):
+@main.route('/recipe/<int:recipe_id>')
+def recipe_by_id(recipe_id):
+    """Eski sayısal tarif adresleri slug'lı adrese kalıcı yönlenir"""
+    slug = router.recipe_slug(recipe_id)
+    if slug is None:
+        abort(404)
+    return redirect(url_for('main.recipe_detail', slug=slug), 301)
+
+@main.route('/recipe/<slug>')
+def recipe_detail(slug):
     """Tarif detay sayfası"""
+    recipe_id = router.recipe_id(slug)
+    if recipe_id is None:
+        return canonical_redirect('main.recipe_detail', slug, router.recipe_id)
     recipe = Recipe.query.get_or_404(recipe_id)
-    comments = Comment.query.filter_by(recipe_id=recipe_id).order_by(Comment.created_at.desc()).all()
+    comments, next_cursor = comment_page(recipe_id)
     related_recipes = Recipe.query.filter(
         Recipe.category_id == recipe.category_id,
         Recipe.id != recipe_id
     ).limit(4).all()
-    return render_template('recipe_detail.html', recipe=recipe, comments=comments, related_recipes=related_recipes)
-
-@app.route('/recipe/<int:recipe_id>/comment', methods=['POST'])
+    return render_template('recipe_detail.html', recipe=recipe, comments=comments,
+                           next_cursor=next_cursor, related_recipes=related_recipes)
+
+@main.route('/recipe/<int:recipe_id>/comments')
+def more_comments(recipe_id):
+    """Yorumların sonraki sayfası ("daha fazla yükle")"""
+    cursor = decode_cursor(request.args.get('cursor', ''))
+    if cursor is None:
+        return jsonify(error='Geçersiz cursor.'), 400
+    comments, next_cursor = comment_page(recipe_id, cursor)
+    html = ''.join(render_comment(comment) for comment in comments)
+    return jsonify(html=html, next_cursor=next_cursor)
+
+@main.route('/recipe/<int:recipe_id>/comment', methods=['POST'])
 @login_required
+@limiter.limit('5/minute', per='user')
+@limiter.limit('20/minute', per='ip')
 def add_comment(recipe_id):
     """Yorum ekleme"""
     recipe = Recipe.query.get_or_404(recipe_id)
+    # commit nesneyi expire eder; adres önceden alınır, tarif yeniden yüklenmez
+    detail_url = url_for('main.recipe_detail', slug=recipe.slug)
     body = request.form.get('body')
     rating = request.form.get('rating', type=int)
     
+    is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+    
     if not body:
+        if is_ajax:
+            return 'Yorum boş olamaz.', 400
         flash('Yorum boş olamaz.', 'danger')
-        return redirect(url_for('recipe_detail', recipe_id=recipe_id))
+        return redirect(detail_url)
     
     comment = Comment(
         recipe_id=recipe_id,
@@ -80,33 +306,87 @@ def add_comment(recipe_id):
     db.session.add(comment)
     db.session.commit()
     
+    html = render_comment(comment)
+    broker.publish(f'recipe:{recipe_id}', 'comment', {'id': comment.id, 'html': html})
+    
+    if is_ajax:
+        return html, 201
     flash('Yorumunuz eklendi.', 'success')
-    return redirect(url_for('recipe_detail', recipe_id=recipe_id))
-
-@app.route('/about')
+    return redirect(detail_url)
+
+@main.route('/recipe/<int:recipe_id>/comments/stream')
+def comment_stream(recipe_id):
+    """Yeni yorumlar için Server-Sent Events akışı"""
+    Recipe.query.get_or_404(recipe_id)
+    channel = f'recipe:{recipe_id}'
+    events = broker.subscribe(channel, limit=current_app.config['SSE_MAX_STREAMS'])
+    if events is None:
+        # Worker'ın akış kotası dolu: 204'te EventSource yeniden bağlanmaz
+        return Response(status=204)
+    max_duration = current_app.config['SSE_MAX_DURATION']
+    heartbeat = current_app.config['SSE_HEARTBEAT']
+    
+    # Akış app context dışında çalışır; DB bağlantısı tutulmaz
+    def stream():
+        yield 'retry: 3000\n\n'
+        deadline = time.monotonic() + max_duration
+        while time.monotonic() < deadline:
+            try:
+                event, data = events.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ': keep-alive\n\n'
+                continue
+            yield f'event: {event}\ndata: {json.dumps(data)}\n\n'
+    
+    response = Response(stream(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # Generator hiç başlamadan kapansa da (istemci koptu) kota geri verilir
+    response.call_on_close(lambda: broker.unsubscribe(channel, events))
+    return response
+
+@main.route('/sitemap.xml')
+def sitemap():
+    """Sitemap index (diskten, ORM'e dokunmadan)"""
+    return feeds.send('sitemap.xml')
+
+@main.route('/sitemaps/<filename>')
+def sitemap_part(filename):
+    """Sitemap parçaları"""
+    return feeds.send(f'sitemaps/{filename}')
+
+@main.route('/feeds/<path:filename>')
+def feed(filename):
+    """RSS/Atom akışları: latest.rss, category/<slug>.atom ..."""
+    return feeds.send(f'feeds/{filename}')
+
+@main.route('/about')
+@prerender.prerendered
 def about():
     """Hakkımızda sayfası"""
     page = Page.query.filter_by(slug='about').first()
     return render_template('about.html', page=page)
 
-@app.route('/testimonials')
+@main.route('/testimonials')
 def testimonials():
     """Referanslar/Yorumlar sayfası"""
-    comments = Comment.query.order_by(Comment.created_at.desc()).limit(20).all()
+    comments = Comment.query.options(joinedload(Comment.user), joinedload(Comment.recipe)) \
+        .order_by(Comment.created_at.desc()).limit(20).all()
     return render_template('testimonials.html', comments=comments)
 
-@app.route('/contact')
+@main.route('/contact')
+@prerender.prerendered
 def contact():
     """İletişim sayfası"""
     return render_template('contact.html')
 
 # ============= AUTH ROUTES =============
 
-@app.route('/register', methods=['GET', 'POST'])
+@main.route('/register', methods=['GET', 'POST'])
+@limiter.limit('10/hour', per='ip', methods=['POST'])
 def register():
     """Kullanıcı kaydı"""
     if current_user.is_authenticated:
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     
     if request.method == 'POST':
         username = request.form.get('username')
@@ -115,15 +395,15 @@ def register():
         
         if not username or not password:
             flash('Kullanıcı adı ve şifre gerekli.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
         
         if password != password_confirm:
             flash('Şifreler eşleşmiyor.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
         
         if User.query.filter_by(username=username).first():
             flash('Bu kullanıcı adı zaten alınmış.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
         
         user = User(username=username)
         user.set_password(password)
@@ -131,15 +411,16 @@ def register():
         db.session.commit()
         
         flash('Kayıt başarılı! Giriş yapabilirsiniz.', 'success')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
     
     return render_template('register.html')
 
-@app.route('/login', methods=['GET', 'POST'])
+@main.route('/login', methods=['GET', 'POST'])
+@limiter.limit('10/minute', per='ip', methods=['POST'])
 def login():
     """Kullanıcı girişi"""
     if current_user.is_authenticated:
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     
     if request.method == 'POST':
         username = request.form.get('username')
@@ -147,34 +428,35 @@ def login():
         
         user = User.query.filter_by(username=username).first()
         
-        if user and user.check_password(password):
+        if user and user.is_active and user.check_password(password):
             login_user(user)
             next_page = request.args.get('next')
             flash('Giriş başarılı!', 'success')
-            return redirect(next_page if next_page else url_for('index'))
+            return redirect(next_page if next_page else url_for('main.index'))
         else:
             flash('Kullanıcı adı veya şifre hatalı.', 'danger')
     
     return render_template('login.html')
 
-@app.route('/logout')
+@main.route('/logout')
 @login_required
 def logout():
     """Çıkış"""
     logout_user()
     flash('Çıkış yapıldı.', 'info')
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
 
 # ============= USER ROUTES =============
 
-@app.route('/my-recipes')
+@main.route('/my-recipes')
 @login_required
 def my_recipes():
     """Kullanıcının tarifleri"""
-    recipes = Recipe.query.filter_by(user_id=current_user.id).order_by(Recipe.created_at.desc()).all()
+    recipes = Recipe.query.options(selectinload(Recipe.cover_image)) \
+        .filter_by(user_id=current_user.id).order_by(Recipe.created_at.desc()).all()
     return render_template('my_recipes.html', recipes=recipes)
 
-@app.route('/recipe/add', methods=['GET', 'POST'])
+@main.route('/recipe/add', methods=['GET', 'POST'])
 @login_required
 def add_recipe():
     """Tarif ekleme"""
@@ -190,17 +472,14 @@ def add_recipe():
         
         if not title or not content or not category_id:
             flash('Başlık, açıklama ve kategori gerekli.', 'danger')
-            return redirect(url_for('add_recipe'))
+            return redirect(url_for('main.add_recipe'))
         
         # Ana resmi yükle
         image_filename = None
         if 'image' in request.files:
             file = request.files['image']
             if file and file.filename and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                image_filename = f"{timestamp}_{filename}"
-                file.save(os.path.join(app.config['UPLOAD_FOLDER'], image_filename))
+                image_filename = save_upload(file, current_app.config['UPLOAD_FOLDER'])
         
         recipe = Recipe(
             title=title,
@@ -212,18 +491,19 @@ def add_recipe():
             image=image_filename,
             prep_time=prep_time,
             cook_time=cook_time,
-            servings=servings
+            servings=servings,
+            images=gallery_images()  # tek flush'ta toplu INSERT
         )
         db.session.add(recipe)
         db.session.commit()
         
         flash('Tarif eklendi!', 'success')
-        return redirect(url_for('recipe_detail', recipe_id=recipe.id))
+        return redirect(url_for('main.recipe_detail', slug=recipe.slug))
     
     categories = Category.query.all()
     return render_template('add_recipe.html', categories=categories)
 
-@app.route('/recipe/<int:recipe_id>/edit', methods=['GET', 'POST'])
+@main.route('/recipe/<int:recipe_id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit_recipe(recipe_id):
     """Tarif düzenleme"""
@@ -231,7 +511,7 @@ def edit_recipe(recipe_id):
     
     if recipe.user_id != current_user.id and not current_user.is_admin:
         flash('Bu tarifi düzenleme yetkiniz yok.', 'danger')
-        return redirect(url_for('recipe_detail', recipe_id=recipe_id))
+        return redirect(url_for('main.recipe_detail', slug=recipe.slug))
     
     if request.method == 'POST':
         recipe.title = request.form.get('title')
@@ -247,20 +527,26 @@ def edit_recipe(recipe_id):
         if 'image' in request.files:
             file = request.files['image']
             if file and file.filename and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                image_filename = f"{timestamp}_{filename}"
-                file.save(os.path.join(app.config['UPLOAD_FOLDER'], image_filename))
-                recipe.image = image_filename
+                recipe.image = save_upload(file, current_app.config['UPLOAD_FOLDER'])
+        
+        # Galeri: işaretlenenleri çıkar, yenileri ekle, sırayı yeniden numarala
+        delete_ids = set(request.form.getlist('delete_images', type=int))
+        kept = [image for image in recipe.images if image.id not in delete_ids]
+        removed = [image.filename for image in recipe.images if image.id in delete_ids]
+        recipe.images = kept + gallery_images(len(kept))
+        for position, image in enumerate(recipe.images):
+            image.position = position
         
+        detail_url = url_for('main.recipe_detail', slug=recipe.slug)
         db.session.commit()
+        remove_uploads(current_app.config['UPLOAD_FOLDER'], removed)
         flash('Tarif güncellendi!', 'success')
-        return redirect(url_for('recipe_detail', recipe_id=recipe_id))
+        return redirect(detail_url)
     
     categories = Category.query.all()
     return render_template('edit_recipe.html', recipe=recipe, categories=categories)
 
-@app.route('/recipe/<int:recipe_id>/delete', methods=['POST'])
+@main.route('/recipe/<int:recipe_id>/delete', methods=['POST'])
 @login_required
 def delete_recipe(recipe_id):
     """Tarif silme"""
@@ -268,288 +554,115 @@ def delete_recipe(recipe_id):
     
     if recipe.user_id != current_user.id and not current_user.is_admin:
         flash('Bu tarifi silme yetkiniz yok.', 'danger')
-        return redirect(url_for('recipe_detail', recipe_id=recipe_id))
+        return redirect(url_for('main.recipe_detail', slug=recipe.slug))
     
-    db.session.delete(recipe)
-    db.session.commit()
+    remove_recipe(recipe)
     flash('Tarif silindi.', 'info')
-    return redirect(url_for('my_recipes'))
-
-# ============= ADMIN ROUTES =============
-
-def admin_required(f):
-    """Admin kontrolü decorator"""
-    from functools import wraps
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated or not current_user.is_admin:
-            flash('Bu sayfaya erişim yetkiniz yok.', 'danger')
-            return redirect(url_for('index'))
-        return f(*args, **kwargs)
-    return decorated_function
-
-@app.route('/admin')
-@login_required
-@admin_required
-def admin_dashboard():
-    """Admin panel ana sayfa"""
-    stats = {
-        'users': User.query.count(),
-        'recipes': Recipe.query.count(),
-        'categories': Category.query.count(),
-        'comments': Comment.query.count()
-    }
-    return render_template('admin/dashboard.html', stats=stats)
-
-# ============= ADMIN - RECIPES =============
-
-@app.route('/admin/recipes')
-@login_required
-@admin_required
-def admin_recipes():
-    """Admin - Tarifler listesi"""
-    recipes = Recipe.query.order_by(Recipe.created_at.desc()).all()
-    return render_template('admin/recipes.html', recipes=recipes)
-
-@app.route('/admin/recipes/<int:recipe_id>/delete', methods=['POST'])
-@login_required
-@admin_required
-def admin_delete_recipe(recipe_id):
-    """Admin - Tarif silme"""
-    recipe = Recipe.query.get_or_404(recipe_id)
-    db.session.delete(recipe)
-    db.session.commit()
-    flash('Tarif silindi.', 'success')
-    return redirect(url_for('admin_recipes'))
-
-# ============= ADMIN - CATEGORIES =============
-
-@app.route('/admin/categories')
-@login_required
-@admin_required
-def admin_categories():
-    """Admin - Kategoriler listesi"""
-    categories = Category.query.all()
-    return render_template('admin/categories.html', categories=categories)
-
-@app.route('/admin/categories/add', methods=['GET', 'POST'])
-@login_required
-@admin_required
-def admin_add_category():
-    """Admin - Kategori ekleme"""
-    if request.method == 'POST':
-        name = request.form.get('name')
-        slug = request.form.get('slug')
-        description = request.form.get('description')
-        
-        if not name or not slug:
-            flash('İsim ve slug gerekli.', 'danger')
-            return redirect(url_for('admin_add_category'))
-        
-        if Category.query.filter_by(slug=slug).first():
-            flash('Bu slug zaten kullanılıyor.', 'danger')
-            return redirect(url_for('admin_add_category'))
-        
-        category = Category(name=name, slug=slug, description=description)
-        db.session.add(category)
-        db.session.commit()
-        
-        flash('Kategori eklendi!', 'success')
-        return redirect(url_for('admin_categories'))
-    
-    return render_template('admin/add_category.html')
-
-@app.route('/admin/categories/<int:category_id>/edit', methods=['GET', 'POST'])
-@login_required
-@admin_required
-def admin_edit_category(category_id):
-    """Admin - Kategori düzenleme"""
-    category = Category.query.get_or_404(category_id)
-    
-    if request.method == 'POST':
-        category.name = request.form.get('name')
-        category.slug = request.form.get('slug')
-        category.description = request.form.get('description')
-        
-        db.session.commit()
-        flash('Kategori güncellendi!', 'success')
-        return redirect(url_for('admin_categories'))
-    
-    return render_template('admin/edit_category.html', category=category)
-
-@app.route('/admin/categories/<int:category_id>/delete', methods=['POST'])
-@login_required
-@admin_required
-def admin_delete_category(category_id):
-    """Admin - Kategori silme"""
-    category = Category.query.get_or_404(category_id)
-    
-    if category.recipes:
-        flash('Bu kategoriye ait tarifler var, önce onları silin veya taşıyın.', 'danger')
-        return redirect(url_for('admin_categories'))
-    
-    db.session.delete(category)
-    db.session.commit()
-    flash('Kategori silindi.', 'success')
-    return redirect(url_for('admin_categories'))
-
-# ============= ADMIN - USERS =============
-
-@app.route('/admin/users')
-@login_required
-@admin_required
-def admin_users():
-    """Admin - Kullanıcılar listesi"""
-    users = User.query.all()
-    return render_template('admin/users.html', users=users)
-
-@app.route('/admin/users/<int:user_id>/toggle-admin', methods=['POST'])
-@login_required
-@admin_required
-def admin_toggle_user_admin(user_id):
-    """Admin - Kullanıcı admin durumunu değiştir"""
-    user = User.query.get_or_404(user_id)
-    
-    if user.id == current_user.id:
-        flash('Kendi admin durumunuzu değiştiremezsiniz.', 'danger')
-        return redirect(url_for('admin_users'))
-    
-    user.is_admin = not user.is_admin
-    db.session.commit()
-    flash(f"Kullanıcı {'admin yapıldı' if user.is_admin else 'admin değil'}", 'success')
-    return redirect(url_for('admin_users'))
-
-@app.route('/admin/users/<int:user_id>/delete', methods=['POST'])
-@login_required
-@admin_required
-def admin_delete_user(user_id):
-    """Admin - Kullanıcı silme"""
-    user = User.query.get_or_404(user_id)
-    
-    if user.id == current_user.id:
-        flash('Kendi hesabınızı silemezsiniz.', 'danger')
-        return redirect(url_for('admin_users'))
-    
-    db.session.delete(user)
-    db.session.commit()
-    flash('Kullanıcı silindi.', 'success')
-    return redirect(url_for('admin_users'))
-
-# ============= ADMIN - COMMENTS =============
-
-@app.route('/admin/comments')
-@login_required
-@admin_required
-def admin_comments():
-    """Admin - Yorumlar listesi"""
-    comments = Comment.query.order_by(Comment.created_at.desc()).all()
-    return render_template('admin/comments.html', comments=comments)
-
-@app.route('/admin/comments/<int:comment_id>/delete', methods=['POST'])
-@login_required
-@admin_required
-def admin_delete_comment(comment_id):
-    """Admin - Yorum silme"""
-    comment = Comment.query.get_or_404(comment_id)
-    db.session.delete(comment)
-    db.session.commit()
-    flash('Yorum silindi.', 'success')
-    return redirect(url_for('admin_comments'))
-
-# ============= ADMIN - PAGES =============
-
-@app.route('/admin/pages')
-@login_required
-@admin_required
-def admin_pages():
-    """Admin - Sayfalar listesi"""
-    pages = Page.query.all()
-    return render_template('admin/pages.html', pages=pages)
-
-@app.route('/admin/pages/add', methods=['GET', 'POST'])
-@login_required
-@admin_required
-def admin_add_page():
-    """Admin - Sayfa ekleme"""
-    if request.method == 'POST':
-        slug = request.form.get('slug')
-        title = request.form.get('title')
-        content = request.form.get('content')
-        
-        if not slug or not title:
-            flash('Slug ve başlık gerekli.', 'danger')
-            return redirect(url_for('admin_add_page'))
-        
-        if Page.query.filter_by(slug=slug).first():
-            flash('Bu slug zaten kullanılıyor.', 'danger')
-            return redirect(url_for('admin_add_page'))
-        
-        page = Page(slug=slug, title=title, content=content)
-        db.session.add(page)
-        db.session.commit()
-        
-        flash('Sayfa eklendi!', 'success')
-        return redirect(url_for('admin_pages'))
-    
-    return render_template('admin/add_page.html')
-
-@app.route('/admin/pages/<int:page_id>/edit', methods=['GET', 'POST'])
-@login_required
-@admin_required
-def admin_edit_page(page_id):
-    """Admin - Sayfa düzenleme"""
-    page = Page.query.get_or_404(page_id)
-    
-    if request.method == 'POST':
-        page.slug = request.form.get('slug')
-        page.title = request.form.get('title')
-        page.content = request.form.get('content')
-        
-        db.session.commit()
-        flash('Sayfa güncellendi!', 'success')
-        return redirect(url_for('admin_pages'))
-    
-    return render_template('admin/edit_page.html', page=page)
-
-@app.route('/admin/pages/<int:page_id>/delete', methods=['POST'])
-@login_required
-@admin_required
-def admin_delete_page(page_id):
-    """Admin - Sayfa silme"""
-    page = Page.query.get_or_404(page_id)
-    db.session.delete(page)
-    db.session.commit()
-    flash('Sayfa silindi.', 'success')
-    return redirect(url_for('admin_pages'))
+    return redirect(url_for('main.my_recipes'))
 
 # ============= ERROR HANDLERS =============
 
-@app.errorhandler(404)
+@main.app_errorhandler(404)
 def not_found_error(error):
     return render_template('404.html'), 404
 
-@app.errorhandler(500)
+@main.app_errorhandler(500)
 def internal_error(error):
     db.session.rollback()
     return render_template('500.html'), 500
 
+# ============= RESPONSE HOOKS =============
+
+@main.after_app_request
+def add_etag(response):
+    """Anonim GET sayfalarına ETag ekle (304 ve sıkıştırma cache'i için)"""
+    if (request.method == 'GET' and response.status_code == 200
+            and response.mimetype == 'text/html'
+            and not response.is_streamed and not response.direct_passthrough
+            and not current_user.is_authenticated):
+        response.add_etag()
+        response.make_conditional(request)
+    return response
+
 # ============= CONTEXT PROCESSORS =============
 
-@app.context_processor
+@main.app_context_processor
 def inject_categories():
     """Tüm template'lerde kategorileri kullanılabilir yap"""
     return dict(all_categories=Category.query.all())
 
 # ============= CLI COMMANDS =============
 
-@app.cli.command()
-def init_db():
-    """Initialize the database."""
+@click.command('init-db')
+@click.option('--seed', is_flag=True, help='Seed sample data if the database is empty.')
+@with_appcontext
+def init_db(seed):
+    """Initialize the database, or upgrade an existing one to the current models."""
     db.create_all()
+    changes = upgrade_schema()
+    for change in changes:
+        print(f'Upgraded: {change}')
+    if changes:
+        # Yeni eklenen özet sütunları varsayılan 0 ile gelir; slug'lar toplu UPDATE ile
+        # doldurulduğu için slug tablosu ve akışlardaki URL'ler elle yenilenir
+        recount_comment_stats()
+        db.session.commit()
+        router.invalidate()
+        feeds.generate_all()
     print('Database initialized.')
+    # Worker yeniden başladığı için yarıda kalmış arka plan silmelerini tamamla
+    purged = purge_deleted_users()
+    if purged:
+        print(f'{purged} deleted account(s) purged.')
+    if seed and not db.session.query(User.id).first():
+        from seed import seed_database
+        seed_database(current_app, drop=False)
+        feeds.generate_all()
+
+@click.command('compile-templates')
+@with_appcontext
+def compile_templates():
+    """Compile all templates into the bytecode cache."""
+    started = time.perf_counter()
+    names = current_app.jinja_env.list_templates()
+    for name in names:
+        current_app.jinja_env.get_template(name)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f'{len(names)} templates compiled in {elapsed:.0f}ms.')
+
+@click.command('recount-comments')
+@with_appcontext
+def recount_comments():
+    """Recompute stored comment counts and ratings for all recipes."""
+    recount_comment_stats()
+    db.session.commit()
+    print('Comment stats recomputed.')
+
+@click.command('purge-deleted-users')
+@with_appcontext
+def purge_deleted_users_command():
+    """Finish deleting accounts whose background purge was interrupted."""
+    count = purge_deleted_users()
+    print(f'{count} deleted account(s) purged.')
+
+@click.command('generate-feeds')
+@with_appcontext
+def generate_feeds():
+    """Regenerate sitemap and RSS/Atom feed files from scratch."""
+    started = time.perf_counter()
+    feeds.generate_all()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f'Sitemap and feeds written to {current_app.config["FEEDS_FOLDER"]} in {elapsed:.0f}ms.')
+
+@click.command('prerender-pages')
+@with_appcontext
+def prerender_pages():
+    """Render static content pages (about, contact) to HTML files."""
+    prerender.render_all()
+    endpoints = prerender.endpoints()
+    print(f'{len(endpoints)} page(s) written to {current_app.config["PRERENDER_FOLDER"]}: {", ".join(endpoints)}')
 
 if __name__ == '__main__':
+    app = create_app({'TEMPLATES_AUTO_RELOAD': True})
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-    with app.app_context():
-        db.create_all()
     app.run(debug=True)
@@ -0,0 +1,61 @@
+"""Veritabanından türetilip diske yazılan dosyalar için ortak yardımcılar.
+
+Akışlar (feeds.py), önceden render edilen sayfalar (prerender.py) ve slug
+tablosu sürümü (routing.py) aynı şekilde çalışır: değişiklikler flush
+sırasında session.info'da biriktirilir, commit sonrası dosyalar atomik
+olarak yeniden yazılır, rollback'te biriken değişiklikler atılır.
+"""
+import os
+import tempfile
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+def write_atomic(path, body):
+    """Dosyayı aynı dizinde geçici dosya + rename ile yaz; okuyan yarım dosya görmez.
+
+    İçerik aynıysa dosyaya dokunulmaz (ETag ve Last-Modified korunur).
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == body:
+                return
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(body)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def track_changes(key, extension, collect, apply):
+    """Flush edilen değişiklikleri `session.info[key]`'de biriktir, commit sonrası uygula.
+
+    collect(session, objects): flush edilen yeni, değişen ve silinen nesnelerden
+    `session.info[key]`'i günceller. apply(extension, changes): commit sonrası
+    `current_app.extensions[extension]` ile çağrılır; app context'i veya
+    extension yoksa (ör. seed betiği) atlanır.
+    """
+    def collect_changes(session, flush_context):
+        collect(session, list(session.new) + list(session.dirty) + list(session.deleted))
+
+    def apply_changes(session):
+        changes = session.info.pop(key, None)
+        if changes and has_app_context() and extension in current_app.extensions:
+            apply(current_app.extensions[extension], changes)
+
+    def discard_changes(session):
+        session.info.pop(key, None)
+
+    event.listen(Session, 'after_flush', collect_changes)
+    event.listen(Session, 'after_commit', apply_changes)
+    event.listen(Session, 'after_rollback', discard_changes)
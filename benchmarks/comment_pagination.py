@@ -0,0 +1,68 @@
+"""Yorum sayısı arttıkça tarif detay sayfası gecikmesi.
+
+Tarif 1'e sırasıyla 100, 1k, 10k, 100k yorum eklenir ve her seviyede detay
+sayfası ile "daha fazla yükle" endpoint'i ölçülür. Kullanım:
+python benchmarks/comment_pagination.py [tekrar_sayısı]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from isolation import isolated_env  # noqa: E402
+
+os.environ.update(isolated_env(tempfile.mkdtemp()))
+
+from app import create_app  # noqa: E402
+from models import db, Comment, Recipe, recount_comment_stats  # noqa: E402
+from seed import seed_database  # noqa: E402
+
+LEVELS = [100, 1000, 10000, 100000]
+
+
+def fill_comments(total, existing):
+    start = datetime(2024, 1, 1)
+    rows = [{'recipe_id': 1, 'user_id': 2, 'body': f'yorum {i}', 'rating': i % 5 + 1,
+             'created_at': start + timedelta(seconds=i)} for i in range(existing, total)]
+    for offset in range(0, len(rows), 10000):
+        db.session.execute(Comment.__table__.insert(), rows[offset:offset + 10000])
+    recount_comment_stats([1])
+    db.session.commit()
+
+
+def timed(client, path, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(path)
+    return (time.perf_counter() - start) / repeat, response
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    app = create_app()
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_database(app)
+    client = app.test_client()
+
+    print(f"{'comments':>9} {'detail':>10} {'load more':>10} {'bytes':>8}")
+    existing = 0
+    with app.app_context():
+        existing = Comment.query.filter_by(recipe_id=1).count()
+        # /recipe/1 kanonik adrese 301 ile yönlenir; ölçüm slug adresinden yapılır
+        path = f'/recipe/{db.session.get(Recipe, 1).slug}'
+    for level in LEVELS:
+        with app.app_context():
+            fill_comments(level, existing)
+        existing = level
+        detail, response = timed(client, path, repeat)
+        cursor = response.get_data(as_text=True).split('data-cursor="')[1].split('"')[0]
+        more, _ = timed(client, f'/recipe/1/comments?cursor={cursor}', repeat)
+        print(f'{level:9d} {detail * 1000:8.2f}ms {more * 1000:8.2f}ms {len(response.get_data()):8d}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Yorum ekleme maliyeti: POST-redirect-GET vs. AJAX parça cevabı.
+
+Her yöntem için istek başına süre, SQL sorgu sayısı ve transfer edilen byte
+ölçülür. Kullanım: python benchmarks/comments.py [tekrar_sayısı]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from isolation import isolated_env  # noqa: E402
+
+os.environ.update(isolated_env(tempfile.mkdtemp()))
+
+from sqlalchemy import event  # noqa: E402
+from app import create_app  # noqa: E402
+from models import db  # noqa: E402
+from seed import seed_database  # noqa: E402
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    app = create_app({'RATELIMIT_ENABLED': False})
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_database(app)
+
+    statements = [0]
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda *args: statements.__setitem__(0, statements[0] + 1))
+
+    client = app.test_client()
+    client.post('/login', data={'username': 'ayse', 'password': '12345'})
+
+    modes = {
+        'POST-redirect-GET': dict(follow_redirects=True),
+        'AJAX fragment': dict(headers={'X-Requested-With': 'XMLHttpRequest'}),
+    }
+    print(f"{'mode':20} {'time/req':>10} {'queries':>8} {'bytes':>8}")
+    for name, options in modes.items():
+        statements[0] = 0
+        size = 0
+        start = time.perf_counter()
+        for i in range(repeat):
+            response = client.post('/recipe/1/comment', data={'body': f'yorum {i}', 'rating': '5'},
+                                   **options)
+            size += len(response.get_data())
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f'{name:20} {elapsed * 1000:8.2f}ms {statements[0] / repeat:8.1f} {size // repeat:8d}')
+
+
+if __name__ == '__main__':
+    main()
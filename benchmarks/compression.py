@@ -0,0 +1,49 @@
+"""Route başına bytes-on-wire ve sıkıştırma CPU maliyeti ölçümü.
+
+Kullanım: python benchmarks/compression.py [tekrar_sayısı]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from isolation import isolated_env  # noqa: E402
+
+os.environ.update(isolated_env(tempfile.mkdtemp()))
+
+from app import create_app  # noqa: E402
+from seed import seed_database  # noqa: E402
+
+ROUTES = ['/', '/category/kahvalti', '/recipe/menemen', '/testimonials', '/about',
+          '/contact', '/static/css/style.css']
+ENCODINGS = ['identity', 'gzip', 'br']
+
+
+def measure(client, path, encoding, repeat):
+    cpu = time.process_time()
+    for _ in range(repeat):
+        response = client.get(path, headers={'Accept-Encoding': encoding})
+        body = response.get_data()
+    cpu = (time.process_time() - cpu) / repeat
+    return len(body), response.headers.get('Content-Encoding', '-'), cpu
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    app = create_app()
+    seed_database(app)
+    client = app.test_client()
+
+    print(f"{'route':28} {'encoding':9} {'bytes':>8} {'ratio':>6} {'cpu/req':>10}")
+    for path in ROUTES:
+        raw = None
+        for encoding in ENCODINGS:
+            size, applied, cpu = measure(client, path, encoding, repeat)
+            raw = raw or size
+            print(f'{path:28} {applied:9} {size:8d} {size / raw:6.2f} {cpu * 1000:8.2f}ms')
+    print(f'\ncache entries: {len(app.wsgi_app.cache)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""10k tarifli, 100k yorumlu bir kullanıcıyı silme maliyeti.
+
+Aynı veritabanının üç kopyasında karşılaştırılır:
+- orm: eski davranış (ORM cascade her alt satırı yükleyip tek tek siler)
+- cascade: ON DELETE CASCADE + passive_deletes, tek transaction
+- batched: arka plan işinin yaptığı parça parça silme (purge_user)
+Kullanım: python benchmarks/delete_user.py [tarif_sayısı] [yorum_sayısı]
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from isolation import isolated_env  # noqa: E402
+
+workdir = tempfile.mkdtemp()
+os.environ.update(isolated_env(workdir))
+
+from sqlalchemy import event  # noqa: E402
+from app import create_app  # noqa: E402
+from models import db, User, Recipe, Comment, recount_comment_stats  # noqa: E402
+from seed import seed_database  # noqa: E402
+from deletion import delete_user, purge_user  # noqa: E402
+
+
+def build(recipes, comments):
+    """Seed verisine ek olarak user 'bigaccount' ve satırlarını ekle"""
+    app = create_app()
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_database(app)
+    with app.app_context():
+        user = User(username='bigaccount')
+        user.set_password('x')
+        db.session.add(user)
+        db.session.commit()
+        first = db.session.query(db.func.max(Recipe.id)).scalar() + 1
+        start = datetime(2024, 1, 1)
+        rows = [{'title': f'tarif {i}', 'slug': f'bigaccount-tarif-{i}', 'content': 'içerik', 'category_id': 1,
+                 'user_id': user.id, 'created_at': start, 'updated_at': start} for i in range(recipes)]
+        for offset in range(0, len(rows), 10000):
+            db.session.execute(Recipe.__table__.insert(), rows[offset:offset + 10000])
+        # Yorumların %90'ı kendi tariflerine, kalanı seed'deki başka tariflere
+        rows = [{'recipe_id': first + i % recipes if i % 10 else 1 + i % 3, 'user_id': user.id,
+                 'body': f'yorum {i}', 'rating': i % 5 + 1, 'created_at': start + timedelta(seconds=i)}
+                for i in range(comments)]
+        for offset in range(0, len(rows), 10000):
+            db.session.execute(Comment.__table__.insert(), rows[offset:offset + 10000])
+        recount_comment_stats()
+        db.session.commit()
+        return user.id
+
+
+def copy_app(name):
+    path = os.path.join(workdir, f'{name}.db')
+    shutil.copy(os.path.join(workdir, 'bench.db'), path)
+    return create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + path,
+                       'UPLOAD_FOLDER': os.path.join(workdir, 'uploads'),
+                       'USER_DELETE_SYNC_LIMIT': 10 ** 9})
+
+
+def legacy_delete(user):
+    # passive_deletes öncesi: cascade tüm koleksiyonları yükler, satır satır DELETE
+    for recipe in user.recipes:
+        for comment in recipe.comments:
+            db.session.delete(comment)
+        for image in recipe.images:
+            db.session.delete(image)
+        db.session.delete(recipe)
+    for comment in user.comments:
+        db.session.delete(comment)
+    db.session.delete(user)
+    db.session.commit()
+
+
+def measure(name, user_id, action):
+    app = copy_app(name)
+    with app.app_context():
+        statements = []
+        listener = lambda *args: statements.append(1)  # noqa: E731
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        start = time.perf_counter()
+        action(user_id)
+        elapsed = time.perf_counter() - start
+        event.remove(db.engine, 'before_cursor_execute', listener)
+        left = Comment.query.filter_by(user_id=user_id).count() + Recipe.query.filter_by(user_id=user_id).count()
+        stats_ok = db.session.get(Recipe, 1).comment_count == Comment.query.filter_by(recipe_id=1).count()
+        print(f'{name:>8} {elapsed:9.2f}s {len(statements):10d} {left:6d} {str(stats_ok):>6}')
+
+
+def main():
+    recipes = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    comments = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    user_id = build(recipes, comments)
+
+    print(f"{'mode':>8} {'time':>10} {'statements':>10} {'left':>6} {'stats':>6}")
+    measure('orm', user_id, lambda uid: legacy_delete(db.session.get(User, uid)))
+    measure('cascade', user_id, lambda uid: delete_user(db.session.get(User, uid)))
+    measure('batched', user_id, purge_user)
+
+
+if __name__ == '__main__':
+    main()
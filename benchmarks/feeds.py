@@ -0,0 +1,63 @@
+"""Sitemap/akış üretim maliyeti: tam üretim, tek tarif değişikliği ve servis.
+
+Kullanım: python benchmarks/feeds.py [tarif_sayısı]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from isolation import isolated_env  # noqa: E402
+
+workdir = tempfile.mkdtemp()
+os.environ.update(isolated_env(workdir))
+
+from sqlalchemy import event  # noqa: E402
+from app import create_app, feeds  # noqa: E402
+from models import db, Recipe  # noqa: E402
+from seed import seed_database  # noqa: E402
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 120000
+    app = create_app({'FEEDS_ASYNC': False})
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_database(app)
+    with app.app_context():
+        now = datetime.utcnow()
+        rows = [{'title': f'tarif {i}', 'slug': f'tarif-{i}', 'content': 'içerik', 'category_id': 1 + i % 6,
+                 'user_id': 2, 'created_at': now, 'updated_at': now} for i in range(total)]
+        for offset in range(0, len(rows), 10000):
+            db.session.execute(Recipe.__table__.insert(), rows[offset:offset + 10000])
+        db.session.commit()
+
+        start = time.perf_counter()
+        feeds.generate_all()
+        print(f'full generation ({total} recipes): {(time.perf_counter() - start) * 1000:8.1f}ms')
+
+        recipe = db.session.get(Recipe, total // 2)
+        recipe.title = 'güncellendi'
+        start = time.perf_counter()
+        db.session.commit()
+        print(f'single recipe update + regen:     {(time.perf_counter() - start) * 1000:8.1f}ms')
+
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(1))
+    client = app.test_client()
+    paths = ['/sitemap.xml', '/sitemaps/recipes-0.xml', '/feeds/latest.rss', '/feeds/category/kahvalti.atom']
+    for path in paths:
+        start = time.perf_counter()
+        for _ in range(100):
+            response = client.get(path)
+        elapsed = (time.perf_counter() - start) * 10
+        print(f'{path:32s} {elapsed:6.2f}ms {len(response.get_data()):9d}B')
+    print(f'SQL statements while serving: {len(statements)}')
+
+
+if __name__ == '__main__':
+    main()
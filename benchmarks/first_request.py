@@ -0,0 +1,56 @@
+"""Yeni bir worker'daki ilk istek gecikmesi: bytecode cache boş vs. önceden derlenmiş.
+
+Her ölçüm ayrı bir süreçte yapılır (soğuk worker). Kullanım:
+python benchmarks/first_request.py [tekrar_sayısı]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from isolation import isolated_env
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROUTES = ['/', '/category/kahvalti', '/recipe/menemen', '/testimonials', '/about',
+          '/contact', '/login', '/register']
+
+PROBE = '''
+import sys, time
+from app import create_app
+app = create_app()
+client = app.test_client()
+start = time.perf_counter()
+client.get(sys.argv[1])
+print(time.perf_counter() - start)
+'''
+
+
+def first_request(path, env):
+    out = subprocess.run([sys.executable, '-c', PROBE, path], cwd=ROOT, env=env,
+                         check=True, capture_output=True, text=True).stdout
+    return float(out.split()[-1])
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    workdir = tempfile.mkdtemp()
+    cache_dir = os.path.join(workdir, 'jinja')
+    env = dict(os.environ, **isolated_env(workdir), JINJA_BYTECODE_CACHE_DIR=cache_dir)
+    subprocess.run([sys.executable, 'seed.py'], cwd=ROOT, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+    print(f"{'route':22} {'cold':>9} {'precompiled':>12}")
+    for path in ROUTES:
+        cold = []
+        for _ in range(repeat):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            cold.append(first_request(path, env))
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'compile-templates'],
+                       cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+        warm = [first_request(path, env) for _ in range(repeat)]
+        print(f'{path:22} {min(cold) * 1000:7.1f}ms {min(warm) * 1000:10.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
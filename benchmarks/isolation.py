@@ -0,0 +1,17 @@
+"""Benchmark'ların ürettiği dosyalar gerçek instance/ klasörüne yazılmasın.
+
+tests/conftest.py'deki gibi veritabanı, akışlar, önceden render edilen
+sayfalar, slug sürümü ve olay soketleri geçici bir klasöre yönlendirilir.
+"""
+import os
+
+
+def isolated_env(workdir, database='bench.db'):
+    """create_app()'in okuduğu ortam değişkenleri; süreç içi için os.environ.update, alt süreç için env"""
+    return {
+        'DATABASE_URL': 'sqlite:///' + os.path.join(workdir, database),
+        'FEEDS_FOLDER': os.path.join(workdir, 'feeds'),
+        'PRERENDER_FOLDER': os.path.join(workdir, 'pages'),
+        'ROUTING_VERSION_FILE': os.path.join(workdir, 'routing.version'),
+        'EVENTS_FANOUT_DIR': os.path.join(workdir, 'events'),
+    }
@@ -0,0 +1,107 @@
+"""Worker tiplerine göre eşzamanlı bağlantı kapasitesi karşılaştırması.
+
+Her worker tipi için gunicorn ayrı bir süreç olarak başlatılır. Önce N adet
+yavaş istemci (isteğin başlıklarını bitirmeyen bağlantı) açılır, ardından
+normal bir isteğin cevap verip veremediği ve gecikmesi ölçülür. Son olarak
+eşzamanlı normal isteklerle throughput ölçülür.
+
+Kullanım: python benchmarks/load_test.py [sync gthread gevent ...]
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from isolation import isolated_env
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SLOW_CLIENTS = [0, 4, 8, 16, 32, 64]
+CONCURRENCY = 32
+REQUESTS = 400
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(worker_class, port, env):
+    env = dict(env, GUNICORN_WORKER_CLASS=worker_class, GUNICORN_WORKERS='4',
+               GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_ACCESSLOG='')
+    if worker_class == 'sync':
+        env['GUNICORN_THREADS'] = '1'
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'app:create_app()'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/contact', timeout=1).read()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f'{worker_class} sunucusu başlamadı')
+
+
+def probe(port, timeout=2.0):
+    start = time.perf_counter()
+    try:
+        urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=timeout).read()
+    except OSError:
+        return None
+    return time.perf_counter() - start
+
+
+def slow_clients(port, count):
+    sockets = []
+    for _ in range(count):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(b'GET / HTTP/1.1\r\nHost: localhost\r\n')  # başlık bitmiyor
+        sockets.append(sock)
+    time.sleep(0.3)
+    return sockets
+
+
+def throughput(port):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(CONCURRENCY) as pool:
+        results = list(pool.map(lambda _: probe(port, 10), range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    ok = sorted(r for r in results if r is not None)
+    p95 = ok[int(len(ok) * 0.95) - 1] if ok else float('nan')
+    return len(ok) / elapsed, p95
+
+
+def main():
+    worker_classes = sys.argv[1:] or ['sync', 'gthread']
+    env = dict(os.environ, **isolated_env(tempfile.mkdtemp(), 'load.db'))
+    subprocess.run([sys.executable, 'seed.py'], cwd=ROOT, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+    for worker_class in worker_classes:
+        port = free_port()
+        proc = start_server(worker_class, port, env)
+        try:
+            print(f'== {worker_class}')
+            for count in SLOW_CLIENTS:
+                sockets = slow_clients(port, count)
+                latency = probe(port)
+                status = f'{latency * 1000:.1f}ms' if latency is not None else 'TIMEOUT'
+                print(f'  {count:3d} yavaş istemci açıkken istek: {status}')
+                for sock in sockets:
+                    sock.close()
+            rps, p95 = throughput(port)
+            print(f'  {CONCURRENCY} eşzamanlı istek: {rps:.0f} req/s, p95 {p95 * 1000:.1f}ms')
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == '__main__':
+    main()
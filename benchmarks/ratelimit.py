@@ -0,0 +1,63 @@
+"""Rate limit overhead mikrobenchmark'ı (limit aşılmayan istekler için).
+
+Hedef: istek başına < 50µs. Kullanım: python benchmarks/ratelimit.py [iterasyon]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from ratelimit import RateLimiter, create_store  # noqa: E402
+
+BUDGET = 50e-6
+
+
+def per_call(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def store_overhead(url, iterations):
+    store = create_store(url)
+    keys = [f'bench:ip:10.0.{i // 256}.{i % 256}' for i in range(1000)]
+    counter = iter(range(10 ** 9))
+    return per_call(lambda: store.consume([(keys[next(counter) % 1000], 10 ** 9, 10 ** 6)], time.time()),
+                    iterations)
+
+
+def decorator_overhead(url, iterations):
+    app = Flask(__name__)
+    app.config['RATELIMIT_STORAGE_URL'] = url
+    limiter = RateLimiter(app)
+
+    def view():
+        return ''
+
+    limited = limiter.limit('1000000000/second')(view)
+    with app.test_request_context('/bench', method='POST'):
+        plain = per_call(view, iterations)
+        wrapped = per_call(limited, iterations)
+    return wrapped - plain
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    sqlite_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'ratelimit.db')
+    failed = False
+    for name, url in [('memory', 'memory://'), ('sqlite', sqlite_url)]:
+        store = store_overhead(url, iterations)
+        total = decorator_overhead(url, iterations)
+        ok = total < BUDGET
+        failed |= not ok and name == 'memory'
+        print(f'{name:7} store.consume {store * 1e6:7.2f}µs  decorator {total * 1e6:7.2f}µs  '
+              f"{'OK' if ok else 'BUDGET AŞILDI'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Açılış süresi ölçümü: import, create_app, ilk istek ve gunicorn hazır olma.
+
+Kullanım: python benchmarks/startup.py [tekrar_sayısı]
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from isolation import isolated_env
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = '''
+import time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+flask_app = app.create_app()
+t2 = time.perf_counter()
+flask_app.test_client().get('/contact')
+t3 = time.perf_counter()
+print(t1 - t0, t2 - t1, t3 - t2)
+'''
+
+
+def in_process(env):
+    out = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env,
+                         check=True, capture_output=True, text=True).stdout
+    return [float(x) for x in out.split()[-3:]]
+
+
+def gunicorn_ready(env):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    env = dict(env, GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_WORKERS='2', GUNICORN_ACCESSLOG='')
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'app:create_app()'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/contact', timeout=1).read()
+                return time.perf_counter() - start
+            except OSError:
+                if time.perf_counter() - start > 20:
+                    raise RuntimeError('gunicorn başlamadı')
+                time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    env = dict(os.environ, **isolated_env(tempfile.mkdtemp(), 'startup.db'))
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'], cwd=ROOT, env=env,
+                   check=True, stdout=subprocess.DEVNULL)
+
+    samples = [in_process(env) for _ in range(repeat)]
+    for index, label in enumerate(['import app', 'create_app()', 'first request']):
+        best = min(sample[index] for sample in samples)
+        print(f'{label:16} {best * 1000:8.1f}ms')
+
+    for preload in ('1', '0'):
+        ready = min(gunicorn_ready(dict(env, GUNICORN_PRELOAD=preload)) for _ in range(repeat))
+        print(f'gunicorn ready (preload={preload}) {ready * 1000:8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+import threading
+import zlib
+from collections import OrderedDict
+from werkzeug.http import parse_accept_header, parse_etags, unquote_etag
+
+try:
+    import brotli
+except ImportError:  # brotli opsiyonel, yoksa sadece gzip kullanılır
+    brotli = None
+
+# Sıkıştırmaya değer içerik tipleri (text/event-stream bilerek dışarıda)
+COMPRESSIBLE_TYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/xml', 'text/javascript',
+    'application/json', 'application/javascript', 'application/xml',
+    'application/rss+xml', 'application/atom+xml', 'image/svg+xml',
+}
+
+
+class CompressedBodyCache:
+    """ETag + encoding anahtarlı, boyutu sınırlı LRU cache"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _Compressor:
+    """gzip ve brotli için ortak akış (streaming) arayüzü"""
+
+    def __init__(self, encoding, level, brotli_quality):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._obj = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk):
+        if self.encoding == 'br':
+            return self._obj.process(chunk)
+        return self._obj.compress(chunk)
+
+    def flush(self):
+        if self.encoding == 'br':
+            return self._obj.flush()
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._obj.finish()
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """Accept-Encoding'e göre gzip/brotli sıkıştırma yapan WSGI katmanı.
+
+    - min_size altındaki cevaplar olduğu gibi gönderilir.
+    - Boyutu bilinen ve stream_threshold altındaki cevaplar tek seferde
+      sıkıştırılır; ETag'i olan, cookie set etmeyen ve private/no-store
+      olmayan cevapların sıkıştırılmış hali cache'lenir.
+    - Boyutu bilinmeyen veya büyük cevaplar parça parça sıkıştırılır.
+    """
+
+    def __init__(self, app, min_size=500, level=6, brotli_quality=5,
+                 stream_threshold=256 * 1024, cache_size=256):
+        self.app = app
+        self.min_size = min_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.stream_threshold = stream_threshold
+        self.cache = CompressedBodyCache(cache_size)
+        self.encodings = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def negotiate(self, accept_encoding):
+        """İstemcinin desteklediği en iyi encoding'i seç (eşitlikte br önce)"""
+        if not accept_encoding:
+            return None
+        accept = parse_accept_header(accept_encoding)
+        best, best_q = None, 0
+        for encoding in self.encodings:
+            q = accept.quality(encoding)
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def __call__(self, environ, start_response):
+        encoding = self.negotiate(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None or environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.app(environ, start_response)
+
+        captured = {}
+
+        def _start_response(status, headers, exc_info=None):
+            captured['status'] = status
+            captured['headers'] = headers
+            captured['exc_info'] = exc_info
+            return captured.setdefault('writes', []).append
+
+        app_iter = self.app(environ, _start_response)
+        chunks = iter(app_iter)
+        pending = []
+        if 'status' not in captured:
+            # start_response ilk parçada çağrılabilir (PEP 3333)
+            for chunk in chunks:
+                pending.append(chunk)
+                if 'status' in captured:
+                    break
+        pending = captured.get('writes', []) + pending
+
+        status, headers = captured['status'], captured['headers']
+        if status.startswith('304'):
+            headers = _not_modified_headers(headers, environ.get('HTTP_IF_NONE_MATCH'))
+        if not self._should_compress(status, headers):
+            start_response(status, headers, captured['exc_info'])
+            return _chain(pending, chunks, app_iter)
+
+        headers = _vary_accept_encoding(headers)
+        length = _header(headers, 'Content-Length')
+        length = int(length) if length and length.isdigit() else None
+
+        if length is not None and length < self.min_size:
+            start_response(status, headers, captured['exc_info'])
+            return _chain(pending, chunks, app_iter)
+
+        if length is not None and length <= self.stream_threshold:
+            return self._buffered(status, headers, encoding, pending, chunks,
+                                  app_iter, start_response, captured['exc_info'])
+
+        headers = _replace_headers(headers, encoding, None)
+        start_response(status, headers, captured['exc_info'])
+        return self._stream(encoding, pending, chunks, app_iter)
+
+    def _should_compress(self, status, headers):
+        if not status.startswith('200'):
+            return False
+        if _header(headers, 'Content-Encoding'):
+            return False
+        if 'no-transform' in (_header(headers, 'Cache-Control') or '').lower():
+            return False
+        mimetype = (_header(headers, 'Content-Type') or '').split(';')[0].strip().lower()
+        return mimetype in COMPRESSIBLE_TYPES
+
+    def _cache_key(self, headers, encoding):
+        etag = _header(headers, 'ETag')
+        if not etag or _header(headers, 'Set-Cookie'):
+            return None
+        cache_control = (_header(headers, 'Cache-Control') or '').lower()
+        if 'private' in cache_control or 'no-store' in cache_control:
+            return None
+        return (etag, encoding)
+
+    def _buffered(self, status, headers, encoding, pending, chunks, app_iter,
+                  start_response, exc_info):
+        try:
+            body = b''.join(pending) + b''.join(chunks)
+        finally:
+            _close(app_iter)
+
+        key = self._cache_key(headers, encoding)
+        compressed = self.cache.get(key) if key else None
+        if compressed is None:
+            compressor = _Compressor(encoding, self.level, self.brotli_quality)
+            compressed = compressor.compress(body) + compressor.finish()
+            if key:
+                self.cache.set(key, compressed)
+
+        start_response(status, _replace_headers(headers, encoding, len(compressed)), exc_info)
+        return [compressed]
+
+    def _stream(self, encoding, pending, chunks, app_iter):
+        compressor = _Compressor(encoding, self.level, self.brotli_quality)
+        try:
+            for chunk in _chain(pending, chunks, None):
+                if not chunk:
+                    continue
+                data = compressor.compress(chunk) + compressor.flush()
+                if data:
+                    yield data
+            yield compressor.finish()
+        finally:
+            _close(app_iter)
+
+
+def _chain(pending, chunks, app_iter):
+    for chunk in pending:
+        yield chunk
+    try:
+        for chunk in chunks:
+            yield chunk
+    finally:
+        if app_iter is not None:
+            _close(app_iter)
+
+
+def _close(app_iter):
+    close = getattr(app_iter, 'close', None)
+    if close is not None:
+        close()
+
+
+def _header(headers, name):
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _vary_accept_encoding(headers):
+    vary = _header(headers, 'Vary')
+    if vary is None:
+        return headers + [('Vary', 'Accept-Encoding')]
+    if 'accept-encoding' in vary.lower() or vary.strip() == '*':
+        return headers
+    headers = [(k, v) for k, v in headers if k.lower() != 'vary']
+    return headers + [('Vary', f'{vary}, Accept-Encoding')]
+
+
+def _not_modified_headers(headers, if_none_match):
+    """304'te istemcinin elindeki gösterimle aynı ETag biçimini kullan.
+
+    304'te Content-Type olmadığı için 200'ün sıkıştırılıp sıkıştırılmayacağı
+    buradan bilinemez; istemci weak ETag gönderdiyse sıkıştırılmış 200'ü
+    almıştır ve 304 de aynı weak ETag'i taşır.
+    """
+    etag = _header(headers, 'ETag')
+    if not etag or etag.startswith('W/') or not if_none_match:
+        return headers
+    value, _ = unquote_etag(etag)
+    etags = parse_etags(if_none_match)
+    if etags.contains(value) or not etags.contains_weak(value):
+        return headers
+    headers = [(k, f'W/{v}' if k.lower() == 'etag' else v) for k, v in headers]
+    return _vary_accept_encoding(headers)
+
+
+def _replace_headers(headers, encoding, length):
+    result = []
+    for key, value in headers:
+        lower = key.lower()
+        if lower == 'content-length':
+            continue
+        if lower == 'etag' and not value.startswith('W/'):
+            # Sıkıştırılmış gösterim byte olarak farklı, anlamca aynı: weak ETag
+            value = f'W/{value}'
+        result.append((key, value))
+    result.append(('Content-Encoding', encoding))
+    if length is not None:
+        result.append(('Content-Length', str(length)))
+    return result
@@ -0,0 +1,139 @@
+import logging
+import threading
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import delete, func, or_, select
+from models import db, User, Recipe, Comment, Image, recount_comment_stats
+from images import remove_uploads
+from feeds import mark_recipes_changed
+
+logger = logging.getLogger(__name__)
+
+
+def _recipe_filenames(condition):
+    """Koşula uyan tariflerin kapak + galeri dosya adları"""
+    filenames = db.session.scalars(select(Recipe.image).where(condition)).all()
+    filenames += db.session.scalars(
+        select(Image.filename).join(Recipe, Image.recipe_id == Recipe.id).where(condition)).all()
+    return filenames
+
+
+def _chunks(values, size):
+    values = list(values)
+    for offset in range(0, len(values), size):
+        yield values[offset:offset + size]
+
+
+def delete_recipe(recipe):
+    """Tarifi sil; yorum ve galeri satırlarını veritabanı ON DELETE CASCADE ile siler"""
+    filenames = _recipe_filenames(Recipe.id == recipe.id)
+    db.session.delete(recipe)
+    db.session.commit()
+    remove_uploads(current_app.config['UPLOAD_FOLDER'], filenames)
+
+
+def delete_user(user):
+    """Kullanıcıyı sil. True: hemen silindi, False: arka plan işine bırakıldı.
+
+    Küçük hesaplar tek transaction'da silinir. Silinecek tarif + yorum
+    (tariflerine başkalarının yazdıkları dahil) `USER_DELETE_SYNC_LIMIT`'ten
+    fazlaysa hesap önce `deleted_at` ile kapatılır (giriş yapamaz, admin
+    listelerinde görünmez), satırlar arka planda parça parça silinir. Tarifleri
+    bu iş ilerledikçe sitedeki listelerden ve akışlardan kalkar; yarıda kalan
+    işler `flask init-db` ve `flask purge-deleted-users` ile tamamlanır.
+    """
+    owned = select(Recipe.id).where(Recipe.user_id == user.id)
+    recipes = db.session.scalar(select(func.count()).select_from(owned.subquery()))
+    # Tariflerindeki tüm yorumlar cascade ile aynı transaction'da silinir
+    comments = db.session.scalar(select(func.count(Comment.id)).where(
+        or_(Comment.user_id == user.id, Comment.recipe_id.in_(owned))))
+    if recipes + comments <= current_app.config['USER_DELETE_SYNC_LIMIT']:
+        _delete_user_now(user)
+        return True
+
+    user.deleted_at = datetime.utcnow()
+    db.session.commit()
+    app = current_app._get_current_object()
+    threading.Thread(target=_purge_in_background, args=(app, user.id), daemon=True,
+                     name=f'purge-user-{user.id}').start()
+    return False
+
+
+def _delete_user_now(user):
+    filenames = _recipe_filenames(Recipe.user_id == user.id)
+    # Tarifler cascade ile silinir, flush event'i görmez; akışlara elle bildirilir
+    mark_recipes_changed(db.session, db.session.execute(
+        select(Recipe.id, Recipe.category_id).where(Recipe.user_id == user.id)).all())
+    # Başkalarının tariflerine yazdığı yorumlar o tariflerin özetini değiştirir
+    affected = db.session.scalars(
+        select(Comment.recipe_id).join(Recipe, Comment.recipe_id == Recipe.id)
+        .where(Comment.user_id == user.id, Recipe.user_id != user.id).distinct()).all()
+    db.session.delete(user)
+    db.session.flush()
+    for recipe_ids in _chunks(affected, 500):
+        recount_comment_stats(recipe_ids)
+    db.session.commit()
+    remove_uploads(current_app.config['UPLOAD_FOLDER'], filenames)
+
+
+def _purge_in_background(app, user_id):
+    with app.app_context():
+        try:
+            purge_user(user_id)
+        except Exception:
+            db.session.rollback()
+            logger.exception('Kullanıcı %s silinemedi; "flask purge-deleted-users" ile devam edilebilir',
+                             user_id)
+        finally:
+            db.session.remove()
+
+
+def purge_user(user_id, batch_size=None):
+    """Kullanıcının satırlarını parça parça sil; her parça ayrı commit edilir.
+
+    Yarıda kesilirse kaldığı yerden devam eder. Önce tarifler silinir (kendi
+    tariflerindeki tüm yorumlar cascade ile gider), sonra başka tariflere
+    yazdığı yorumlar; özetler sadece bu ikinci adımda etkilenen tariflerde
+    yeniden hesaplanır.
+    """
+    batch_size = batch_size or current_app.config['USER_DELETE_BATCH_SIZE']
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+
+    while True:
+        rows = db.session.execute(
+            select(Recipe.id, Recipe.category_id).where(Recipe.user_id == user_id).limit(batch_size)).all()
+        if not rows:
+            break
+        recipe_ids = [recipe_id for recipe_id, _ in rows]
+        mark_recipes_changed(db.session, rows)
+        filenames = _recipe_filenames(Recipe.id.in_(recipe_ids))
+        db.session.execute(delete(Recipe).where(Recipe.id.in_(recipe_ids)),
+                           execution_options={'synchronize_session': False})
+        db.session.commit()
+        remove_uploads(upload_folder, filenames)
+
+    while True:
+        comment_ids = db.session.scalars(
+            select(Comment.id).where(Comment.user_id == user_id).limit(batch_size)).all()
+        if not comment_ids:
+            break
+        affected = db.session.scalars(
+            select(Comment.recipe_id).where(Comment.id.in_(comment_ids)).distinct()).all()
+        # Toplu DELETE mapper event'lerini tetiklemez, özetler elle güncellenir
+        db.session.execute(delete(Comment).where(Comment.id.in_(comment_ids)),
+                           execution_options={'synchronize_session': False})
+        recount_comment_stats(affected)
+        db.session.commit()
+
+    db.session.execute(delete(User).where(User.id == user_id),
+                       execution_options={'synchronize_session': False})
+    db.session.commit()
+    db.session.expire_all()
+
+
+def purge_deleted_users():
+    """Silinmeyi bekleyen (yarıda kalmış) tüm hesapları tamamla"""
+    user_ids = db.session.scalars(select(User.id).where(User.deleted_at.is_not(None))).all()
+    for user_id in user_ids:
+        purge_user(user_id)
+    return len(user_ids)
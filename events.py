@@ -0,0 +1,125 @@
+import glob
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class EventBroker:
+    """Süreç içi pub/sub + aynı makinedeki worker'lara yerel fan-out.
+
+    Abonesi olan her worker `EVENTS_FANOUT_DIR` altında `<pid>.sock` adlı bir
+    Unix datagram soketi açar; publish edilen olay önce yerel abonelere, sonra
+    bu dizindeki diğer soketlere gönderilir. Soket ilk abonelikte açıldığı için
+    fork öncesi (preload_app) hiçbir kaynak oluşturulmaz.
+    """
+
+    def __init__(self, app=None):
+        self.fanout_dir = None
+        self._subscribers = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._sock = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('EVENTS_FANOUT_DIR', os.path.join(app.instance_path, 'events'))
+        self.fanout_dir = app.config['EVENTS_FANOUT_DIR']
+        app.extensions['events'] = self
+
+    def subscribe(self, channel, limit=None):
+        """Kanala abone ol, olayların düşeceği kuyruğu döndür.
+
+        limit: bu süreçteki toplam abone (açık akış) sınırı; doluysa None döner.
+        """
+        q = queue.Queue(maxsize=100)
+        with self._lock:
+            if limit is not None and self._count >= limit:
+                return None
+            self._subscribers.setdefault(channel, set()).add(q)
+            self._count += 1
+        self._ensure_listener()
+        return q
+
+    def unsubscribe(self, channel, q):
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None and q in subscribers:
+                subscribers.discard(q)
+                self._count -= 1
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def publish(self, channel, event, data):
+        message = {'channel': channel, 'event': event, 'data': data}
+        self._deliver(message)
+        self._fanout(json.dumps(message).encode('utf-8'))
+
+    def _deliver(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(message['channel'], ()))
+        for q in subscribers:
+            try:
+                q.put_nowait((message['event'], message['data']))
+            except queue.Full:
+                pass  # yavaş istemci; olay atlanır, EventSource yeniden bağlanınca toparlar
+
+    # ----- worker'lar arası fan-out -----
+
+    def _socket_path(self, pid):
+        return os.path.join(self.fanout_dir, f'{pid}.sock')
+
+    def _ensure_listener(self):
+        if not self.fanout_dir or not hasattr(socket, 'AF_UNIX'):
+            return
+        pid = os.getpid()
+        with self._lock:
+            if self._pid == pid:
+                return
+            # Fork sonrası ebeveynden kalan soket bu sürece ait değil
+            os.makedirs(self.fanout_dir, exist_ok=True)
+            path = self._socket_path(pid)
+            if os.path.exists(path):
+                os.unlink(path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            sock.bind(path)
+            self._sock, self._pid = sock, pid
+        threading.Thread(target=self._listen, args=(sock,), daemon=True,
+                         name='event-broker-listener').start()
+
+    def _listen(self, sock):
+        while True:
+            try:
+                payload = sock.recv(256 * 1024)
+                self._deliver(json.loads(payload))
+            except OSError:
+                return
+            except ValueError:
+                logger.warning('Geçersiz olay paketi atlandı')
+
+    def _fanout(self, payload):
+        if not self.fanout_dir or not hasattr(socket, 'AF_UNIX'):
+            return
+        own = self._socket_path(os.getpid())
+        paths = [p for p in glob.glob(os.path.join(self.fanout_dir, '*.sock')) if p != own]
+        if not paths:
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            for path in paths:
+                try:
+                    sock.sendto(payload, path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Ölmüş worker'dan kalan soket
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+                except OSError as error:
+                    logger.warning('Olay %s adresine iletilemedi: %s', path, error)
@@ -0,0 +1,269 @@
+import glob
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from urllib.parse import urlsplit
+from flask import current_app, send_from_directory
+from sqlalchemy import inspect, select
+from models import db, User, Category, Recipe
+from artifacts import remove_file, track_changes, write_atomic
+
+logger = logging.getLogger(__name__)
+
+MIMETYPES = {
+    '.xml': 'application/xml',
+    '.rss': 'application/rss+xml',
+    '.atom': 'application/atom+xml',
+}
+
+
+def _rfc822(value):
+    return format_datetime((value or datetime.utcnow()).replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def _iso(value):
+    return (value or datetime.utcnow()).isoformat(timespec='seconds') + 'Z'
+
+
+class FeedWriter:
+    """Sitemap ve RSS/Atom akışlarını diske statik dosya olarak yazar.
+
+    Dosyalar `FEEDS_FOLDER` altında tutulur; tarif/kategori değişiklikleri
+    session event'leriyle toplanır ve commit sonrası sadece etkilenen sitemap
+    parçası ile akışlar yeniden yazılır. Üretim ORM nesnesi yüklemez (Core
+    select), istekler dosyadan `send_from_directory` ile karşılanır.
+
+        sitemap.xml                  sitemap index
+        sitemaps/pages.xml           sabit sayfalar + kategoriler
+        sitemaps/recipes-<n>.xml     id // FEEDS_SITEMAP_SIZE aralığındaki tarifler
+        feeds/latest.rss|atom        en yeni tarifler
+        feeds/category/<slug>.rss|atom
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._worker = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('FEEDS_FOLDER', os.path.join(app.instance_path, 'feeds'))
+        app.config.setdefault('FEEDS_SITEMAP_SIZE', 50000)  # sitemap protokolü üst sınırı
+        app.config.setdefault('FEEDS_ITEMS', 20)
+        app.config.setdefault('SITE_URL', 'http://localhost:5000')
+        app.config.setdefault('FEEDS_ASYNC', True)  # commit sonrası üretim istek thread'inde beklenmez
+        app.extensions['feeds'] = self
+
+    # ----- servis -----
+
+    def send(self, filename):
+        """Üretilmiş dosyayı gönder; hiç üretilmemişse bir kere tamamını üret"""
+        folder = current_app.config['FEEDS_FOLDER']
+        if not os.path.exists(os.path.join(folder, 'sitemap.xml')):
+            self.generate_all()
+        mimetype = MIMETYPES.get(os.path.splitext(filename)[1], 'application/xml')
+        return send_from_directory(folder, filename, mimetype=mimetype, max_age=300)
+
+    # ----- üretim -----
+
+    def generate_all(self):
+        """Tüm sitemap ve akışları yeniden yaz, artık dosyaları sil"""
+        folder = current_app.config['FEEDS_FOLDER']
+        size = current_app.config['FEEDS_SITEMAP_SIZE']
+        with db.engine.connect() as conn:
+            shards = {recipe_id // size for recipe_id in conn.scalars(select(Recipe.id))}
+            categories = conn.execute(select(Category.id, Category.slug)).all()
+        self.regenerate(shards=shards, category_ids={category.id for category in categories},
+                        pages=True, latest=True)
+        # Artık var olmayan kategori ve sitemap parçalarından kalan dosyalar
+        keep = {self._category_feed(category.slug) for category in categories}
+        for path in glob.glob(os.path.join(folder, 'feeds', 'category', '*')):
+            if os.path.splitext(os.path.relpath(path, folder))[0] not in keep:
+                os.remove(path)
+        for path in glob.glob(os.path.join(folder, 'sitemaps', 'recipes-*.xml')):
+            if int(os.path.basename(path)[len('recipes-'):-len('.xml')]) not in shards:
+                os.remove(path)
+        self._write_index()
+
+    def regenerate(self, shards=(), category_ids=(), removed_slugs=(), pages=False, latest=False):
+        """Sadece verilen sitemap parçalarını ve kategori akışlarını yeniden yaz"""
+        with self._lock, db.engine.connect() as conn:
+            urls = self._url_builder()
+            for shard in shards:
+                self._write_shard(conn, urls, shard)
+            for slug in removed_slugs:
+                for extension in ('.rss', '.atom'):
+                    self._remove(self._category_feed(slug) + extension)
+            categories = conn.execute(
+                select(Category.id, Category.name, Category.slug, Category.description)
+                .where(Category.id.in_(category_ids))).all() if category_ids else []
+            for category in categories:
+                self._write_feed(conn, urls, self._category_feed(category.slug),
+                                 category.name, category.description,
+                                 urls('main.category', slug=category.slug), category.id)
+            if latest:
+                self._write_feed(conn, urls, 'feeds/latest', 'En Yeni Tarifler',
+                                 'Nefis Yemekler\'e eklenen son tarifler', urls('main.index'))
+            if pages:
+                self._write_pages(conn, urls)
+            if shards or pages:
+                self._write_index()
+
+    def schedule(self, shards=(), category_ids=(), removed_slugs=(), pages=False, latest=False):
+        """Değişiklikleri biriktir; tek arka plan thread'i birleşik halini üretir"""
+        app = current_app._get_current_object()
+        with self._pending_lock:
+            pending = self._pending.setdefault(app, {
+                'shards': set(), 'category_ids': set(), 'removed_slugs': set(),
+                'pages': False, 'latest': False})
+            pending['shards'].update(shards)
+            pending['category_ids'].update(category_ids)
+            pending['removed_slugs'].update(removed_slugs)
+            pending['pages'] = pending['pages'] or pages
+            pending['latest'] = pending['latest'] or latest
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._drain, daemon=True, name='feed-writer')
+                self._worker.start()
+
+    def _drain(self):
+        while True:
+            with self._pending_lock:
+                if not self._pending:
+                    self._worker = None
+                    return
+                app, changes = self._pending.popitem()
+            with app.app_context():
+                try:
+                    self.regenerate(**changes)
+                except Exception:
+                    # Veri kaydedildi; akışlar "flask generate-feeds" ile yeniden üretilebilir
+                    logger.exception('Sitemap/akış dosyaları güncellenemedi')
+
+    def _url_builder(self):
+        # İstek dışında (CLI, commit sonrası) da aynı mutlak URL'ler üretilir
+        site = urlsplit(current_app.config['SITE_URL'])
+        adapter = current_app.url_map.bind(site.netloc, script_name=site.path or '/',
+                                           url_scheme=site.scheme or 'http')
+
+        def build(endpoint, **values):
+            return adapter.build(endpoint, values, force_external=True)
+        return build
+
+    @staticmethod
+    def _category_feed(slug):
+        return f'feeds/category/{slug}'
+
+    def _write_shard(self, conn, urls, shard):
+        size = current_app.config['FEEDS_SITEMAP_SIZE']
+        rows = conn.execute(
+            select(Recipe.slug, Recipe.updated_at)
+            .where(Recipe.id >= shard * size, Recipe.id < (shard + 1) * size)
+            .order_by(Recipe.id)).all()
+        filename = f'sitemaps/recipes-{shard}.xml'
+        if not rows:
+            self._remove(filename)
+            return
+        # 50k URL'yi tek tek build etmek yerine slug dışında aynı olan kalıptan üret
+        # (slug'lar [a-z0-9-] olduğu için URL kodlaması gerekmez)
+        marker = 'slug-marker'
+        prefix, _, suffix = urls('main.recipe_detail', slug=marker).partition(marker)
+        entries = [(f'{prefix}{row.slug}{suffix}', _iso(row.updated_at)) for row in rows]
+        self._render(filename, 'feeds/urlset.xml', entries=entries)
+
+    def _write_pages(self, conn, urls):
+        entries = [(urls(endpoint), None)
+                   for endpoint in ('main.index', 'main.about', 'main.testimonials', 'main.contact')]
+        for slug, created_at in conn.execute(select(Category.slug, Category.created_at)):
+            entries.append((urls('main.category', slug=slug), _iso(created_at)))
+        self._render('sitemaps/pages.xml', 'feeds/urlset.xml', entries=entries)
+
+    def _write_index(self):
+        folder = current_app.config['FEEDS_FOLDER']
+        urls = self._url_builder()
+        paths = sorted(glob.glob(os.path.join(folder, 'sitemaps', '*.xml')))
+        entries = [(urls('main.sitemap_part', filename=os.path.basename(path)),
+                    _iso(datetime.fromtimestamp(os.path.getmtime(path), timezone.utc).replace(tzinfo=None)))
+                   for path in paths]
+        self._render('sitemap.xml', 'feeds/sitemapindex.xml', entries=entries)
+
+    def _write_feed(self, conn, urls, name, title, description, link, category_id=None):
+        query = select(Recipe.slug, Recipe.title, Recipe.content, Recipe.created_at, Recipe.updated_at,
+                       User.username) \
+            .join(User, Recipe.user_id == User.id) \
+            .order_by(Recipe.created_at.desc(), Recipe.id.desc()) \
+            .limit(current_app.config['FEEDS_ITEMS'])
+        if category_id is not None:
+            query = query.where(Recipe.category_id == category_id)
+        items = [{
+            'title': row.title,
+            'link': urls('main.recipe_detail', slug=row.slug),
+            'summary': (row.content or '')[:300],
+            'author': row.username,
+            'published': _rfc822(row.created_at),
+            'updated': _iso(row.updated_at or row.created_at),
+            'updated_at': row.updated_at or row.created_at,
+        } for row in conn.execute(query)]
+        updated_at = max((item['updated_at'] for item in items), default=None)
+        for extension, template in (('.rss', 'feeds/rss.xml'), ('.atom', 'feeds/atom.xml')):
+            self._render(name + extension, template, title=title, description=description, link=link,
+                         feed_url=urls('main.feed', filename=name[len('feeds/'):] + extension),
+                         updated=_iso(updated_at), last_build=_rfc822(updated_at), items=items)
+
+    def _render(self, filename, template, **context):
+        body = current_app.jinja_env.get_template(template).render(**context).encode('utf-8')
+        write_atomic(os.path.join(current_app.config['FEEDS_FOLDER'], filename), body)
+
+    def _remove(self, filename):
+        remove_file(os.path.join(current_app.config['FEEDS_FOLDER'], filename))
+
+
+# ----- değişiklik takibi -----
+
+def _changes(session):
+    return session.info.setdefault('feeds_changes', {
+        'recipe_ids': set(), 'category_ids': set(), 'removed_slugs': set(), 'pages': False})
+
+
+def mark_recipes_changed(session, rows):
+    """Toplu (Core) silme/güncellemelerde event tetiklenmez; (id, category_id) elle bildirilir"""
+    changes = _changes(session)
+    for recipe_id, category_id in rows:
+        changes['recipe_ids'].add(recipe_id)
+        changes['category_ids'].add(category_id)
+
+
+def _collect_changes(session, objects):
+    for obj in objects:
+        if isinstance(obj, Recipe):
+            changes = _changes(session)
+            changes['recipe_ids'].add(obj.id)
+            changes['category_ids'].add(obj.category_id)
+            # Kategorisi değişen tarif eski kategorinin akışından da çıkar
+            changes['category_ids'].update(inspect(obj).attrs.category_id.history.deleted)
+        elif isinstance(obj, Category):
+            changes = _changes(session)
+            changes['pages'] = True
+            if obj in session.deleted:
+                changes['removed_slugs'].add(obj.slug)
+            else:
+                changes['category_ids'].add(obj.id)
+                changes['removed_slugs'].update(inspect(obj).attrs.slug.history.deleted)
+
+
+def _regenerate_changed(writer, changes):
+    size = current_app.config['FEEDS_SITEMAP_SIZE']
+    regenerate = writer.schedule if current_app.config['FEEDS_ASYNC'] else writer.regenerate
+    regenerate(
+        shards={recipe_id // size for recipe_id in changes['recipe_ids'] if recipe_id is not None},
+        category_ids={category_id for category_id in changes['category_ids'] if category_id is not None},
+        removed_slugs=changes['removed_slugs'],
+        pages=changes['pages'],
+        latest=bool(changes['recipe_ids']),
+    )
+
+
+track_changes('feeds_changes', 'feeds', _collect_changes, _regenerate_changed)
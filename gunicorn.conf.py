@@ -0,0 +1,74 @@
+"""Gunicorn ayarları.
+
+Worker tipi GUNICORN_WORKER_CLASS ile seçilir:
+- sync:    klasik model, worker başına tek istek (eski varsayılan)
+- gthread: worker başına thread havuzu (varsayılan, ek bağımlılık yok)
+- gevent:  greenlet tabanlı, yavaş istemci/uzun upload için en yüksek
+           eşzamanlılık (`pip install gevent` gerekir)
+
+db.session Flask-SQLAlchemy tarafından app context'e göre scope'lanır;
+app context contextvars üzerinde tutulduğu için her thread/greenlet kendi
+session'ını alır ve istek sonunda teardown ile kapatılır.
+"""
+import multiprocessing
+import os
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+
+if worker_class == 'gevent':
+    workers = int(os.getenv('GUNICORN_WORKERS', cpu_count))
+    threads = 1
+    worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+elif worker_class == 'gthread':
+    workers = int(os.getenv('GUNICORN_WORKERS', cpu_count + 1))
+    threads = int(os.getenv('GUNICORN_THREADS', 8))
+else:
+    workers = int(os.getenv('GUNICORN_WORKERS', cpu_count * 2 + 1))
+    threads = 1
+
+# Uygulama master'da bir kez yüklenir, worker'lar fork ile hazır başlar.
+# create_app() veritabanına bağlanmadığı için fork öncesi açık bağlantı kalmaz.
+# gevent'te kapalı: monkey-patch worker'da yapılır, master'da import edilen
+# modüllerin threading.Lock/Thread nesneleri patch'lenmemiş kalırdı.
+preload_app = os.getenv('GUNICORN_PRELOAD', '0' if worker_class == 'gevent' else '1') == '1'
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+# Docker'da heartbeat dosyası için disk yerine bellek kullan
+worker_tmp_dir = os.getenv('GUNICORN_WORKER_TMP_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else None)
+accesslog = os.getenv('GUNICORN_ACCESSLOG', '-') or None
+
+# DB pool'u worker başına eşzamanlı istek sayısına göre boyutlandır
+# (gevent'te greenlet sayısı pool'u aşmasın diye üst sınır konur)
+if worker_class == 'gevent':
+    db_pool_size = min(worker_connections, int(os.getenv('GUNICORN_DB_POOL_MAX', 20)))
+else:
+    db_pool_size = threads
+os.environ.setdefault('DB_POOL_SIZE', str(db_pool_size))
+
+# Yorum akışı (SSE) her bağlantıda bir thread/greenlet'i dakikalarca tutar.
+# sync: tek istek/worker ve `timeout` akışı öldürür, kapalı. gthread: thread'lerin
+# çoğu normal isteklere kalsın. gevent: greenlet ucuz, bağlantıların yarısı.
+if worker_class == 'gevent':
+    sse_max_streams = worker_connections // 2
+elif worker_class == 'gthread':
+    sse_max_streams = threads // 4
+else:
+    sse_max_streams = 0
+os.environ.setdefault('SSE_MAX_STREAMS', str(sse_max_streams))
+
+# Production'da template değişikliği için her istekte dosya stat edilmesin
+os.environ.setdefault('TEMPLATES_AUTO_RELOAD', '0')
+
+
+def post_fork(server, worker):
+    """Master'dan kalmış olabilecek pool bağlantılarını worker'da kullanma"""
+    flask_app = server.app.callable
+    if flask_app is None:
+        return
+    from models import db
+    with flask_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
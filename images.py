@@ -0,0 +1,70 @@
+import base64
+import io
+import os
+import secrets
+import warnings
+from datetime import datetime
+from werkzeug.utils import secure_filename
+
+try:
+    from PIL import Image as PILImage
+except ImportError:  # Pillow opsiyonel, yoksa placeholder üretilmez
+    PILImage = None
+
+if PILImage is not None:
+    # Pillow MAX_IMAGE_PIXELS ile 2 katı arasında sadece uyarır ve görseli açar
+    warnings.simplefilter('error', PILImage.DecompressionBombWarning)
+
+PLACEHOLDER_SIZE = 16  # px, blur-up önizlemenin uzun kenarı
+# Yüklenen görselin piksel sınırı: birkaç yüz KB'lık PNG açılınca yüzlerce MB'a çıkabilir
+MAX_UPLOAD_PIXELS = 40_000_000
+
+
+def save_upload(file, upload_folder, unique=False):
+    """Yüklenen dosyayı kaydet, dosya adını döndür"""
+    filename = secure_filename(file.filename)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if unique:
+        # Aynı saniyede yüklenen aynı isimli dosyalar çakışmasın
+        timestamp = f'{timestamp}_{secrets.token_hex(4)}'
+    image_filename = f"{timestamp}_{filename}"
+    file.save(os.path.join(upload_folder, image_filename))
+    return image_filename
+
+
+def make_placeholder(path):
+    """Küçük inline önizleme üret: (data URI, genişlik, yükseklik).
+
+    Pillow'un açamadığı dosya (bozuk veya görsel değil) ve `MAX_UPLOAD_PIXELS`'ten
+    büyük görsel silinir, None döner. Boyut başlıktan okunur; sınırı aşan
+    görsel hiç decode edilmez.
+    """
+    if PILImage is None:
+        return None, None, None
+    try:
+        with PILImage.open(path) as img:
+            width, height = img.size
+            if width * height > MAX_UPLOAD_PIXELS:
+                raise ValueError(f'{width}x{height} piksel sınırı aşıyor')
+            # JPEG küçültülmüş ölçekte decode edilir (1/8'e kadar)
+            img.draft('RGB', (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+            img = img.convert('RGB')
+            img.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+            buffer = io.BytesIO()
+            img.save(buffer, format='JPEG', quality=40)
+    except (OSError, ValueError, PILImage.DecompressionBombError, PILImage.DecompressionBombWarning):
+        remove_uploads(os.path.dirname(path), [os.path.basename(path)])
+        return None
+    data = base64.b64encode(buffer.getvalue()).decode('ascii')
+    return f'data:image/jpeg;base64,{data}', width, height
+
+
+def remove_uploads(upload_folder, filenames):
+    """Artık kullanılmayan yüklenmiş dosyaları sil (yoksa sessizce geç)"""
+    for filename in filenames:
+        if not filename:
+            continue
+        try:
+            os.remove(os.path.join(upload_folder, filename))
+        except FileNotFoundError:
+            pass
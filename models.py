@@ -1,5 +1,8 @@
+import sqlite3
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 
@@ -13,10 +16,17 @@ class User(UserMixin, db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    deleted_at = db.Column(db.DateTime)  # arka planda silinmeyi bekliyor
     
-    # İlişkiler
-    recipes = db.relationship('Recipe', backref='author', lazy=True, cascade='all, delete-orphan')
-    comments = db.relationship('Comment', backref='user', lazy=True, cascade='all, delete-orphan')
+    # İlişkiler (alt kayıtları veritabanı ON DELETE CASCADE ile siler)
+    recipes = db.relationship('Recipe', backref='author', lazy=True, cascade='all, delete-orphan',
+                              passive_deletes=True)
+    comments = db.relationship('Comment', backref='user', lazy=True, cascade='all, delete-orphan',
+                               passive_deletes=True)
+    
+    @property
+    def is_active(self):
+        return self.deleted_at is None
     
     def set_password(self, password):
         self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
@@ -49,6 +59,7 @@ class Recipe(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
+    slug = db.Column(db.String(220), unique=True, nullable=False)  # boşsa flush öncesi başlıktan üretilir
     content = db.Column(db.Text, nullable=False)
     ingredients = db.Column(db.Text)  # Malzemeler
     instructions = db.Column(db.Text)  # Tarif adımları
@@ -57,19 +68,26 @@ class Recipe(db.Model):
     servings = db.Column(db.Integer)  # Kaç kişilik
     image = db.Column(db.String(255))
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Yorum özetleri (Comment insert/delete event'leri ile güncellenir)
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # İlişkiler
-    comments = db.relationship('Comment', backref='recipe', lazy=True, cascade='all, delete-orphan')
-    images = db.relationship('Image', backref='recipe', lazy=True, cascade='all, delete-orphan')
+    comments = db.relationship('Comment', backref='recipe', lazy=True, cascade='all, delete-orphan',
+                               passive_deletes=True)
+    images = db.relationship('Image', backref='recipe', lazy=True, cascade='all, delete-orphan',
+                             passive_deletes=True, order_by='Image.position')
+    # Liste sayfalarında selectinload ile tek sorguda yüklenir
+    cover_image = db.relationship(
+        'Image', uselist=False, viewonly=True,
+        primaryjoin='and_(Recipe.id == Image.recipe_id, Image.position == 0)')
     
     def average_rating(self):
-        if not self.comments:
-            return 0
-        ratings = [c.rating for c in self.comments if c.rating]
-        return sum(ratings) / len(ratings) if ratings else 0
+        return self.rating_sum / self.rating_count if self.rating_count else 0
     
     def __repr__(self):
         return f'<Recipe {self.title}>'
@@ -79,16 +97,66 @@ class Comment(db.Model):
     __tablename__ = 'comments'
     
     id = db.Column(db.Integer, primary_key=True)
-    recipe_id = db.Column(db.Integer, db.ForeignKey('recipes.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    recipe_id = db.Column(db.Integer, db.ForeignKey('recipes.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     body = db.Column(db.Text, nullable=False)
     rating = db.Column(db.Integer)  # 1-5 yıldız
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    # Tarif sayfasındaki cursor tabanlı sayfalama için
+    __table_args__ = (db.Index('ix_comments_recipe_created', 'recipe_id', 'created_at', 'id'),)
     
     def __repr__(self):
         return f'<Comment {self.id} on Recipe {self.recipe_id}>'
 
 
+@event.listens_for(Engine, 'connect')
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ON DELETE CASCADE'i sadece bu pragma açıkken uygular
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+
+def _update_comment_stats(connection, comment, sign):
+    connection.execute(
+        Recipe.__table__.update()
+        .where(Recipe.id == comment.recipe_id)
+        .values(
+            comment_count=Recipe.comment_count + sign,
+            rating_sum=Recipe.rating_sum + sign * (comment.rating or 0),
+            rating_count=Recipe.rating_count + (sign if comment.rating else 0)
+        )
+    )
+
+
+@event.listens_for(Comment, 'after_insert')
+def _comment_inserted(mapper, connection, comment):
+    _update_comment_stats(connection, comment, 1)
+
+
+@event.listens_for(Comment, 'after_delete')
+def _comment_deleted(mapper, connection, comment):
+    _update_comment_stats(connection, comment, -1)
+
+
+def recount_comment_stats(recipe_ids=None):
+    """Yorum özetlerini comments tablosundan yeniden hesapla (toplu silme sonrası vb.)"""
+    comments = Comment.__table__
+    
+    def correlated(expression):
+        return select(expression).where(comments.c.recipe_id == Recipe.id).scalar_subquery()
+    statement = Recipe.__table__.update().values(
+        comment_count=correlated(func.count(comments.c.id)),
+        rating_sum=correlated(func.coalesce(func.sum(comments.c.rating), 0)),
+        rating_count=correlated(func.count(comments.c.rating))
+    )
+    if recipe_ids is not None:
+        statement = statement.where(Recipe.id.in_(recipe_ids))
+    db.session.execute(statement)
+
+
 class Page(db.Model):
     __tablename__ = 'pages'
     
@@ -108,8 +176,14 @@ class Image(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(255), nullable=False)
-    recipe_id = db.Column(db.Integer, db.ForeignKey('recipes.id'), nullable=False)
+    recipe_id = db.Column(db.Integer, db.ForeignKey('recipes.id', ondelete='CASCADE'), nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0)  # 0 = kapak
+    placeholder = db.Column(db.Text)  # blur-up için küçük inline önizleme (data URI)
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (db.Index('ix_images_recipe_position', 'recipe_id', 'position'),)
+    
     def __repr__(self):
         return f'<Image {self.filename}>'
@@ -0,0 +1,98 @@
+import logging
+import os
+from functools import wraps
+from flask import current_app, request, send_from_directory, session
+from flask_login import current_user
+from models import Category, Page
+from artifacts import remove_file, track_changes, write_atomic
+
+logger = logging.getLogger(__name__)
+
+
+class PageRenderer:
+    """İçeriği sadece admin kaydıyla değişen sayfaları HTML dosyası olarak önceden render eder.
+
+    `prerendered` ile işaretlenen view'lar anonim GET isteklerinde
+    `PRERENDER_FOLDER/<endpoint>.html` dosyasından sunulur (ETag +
+    Last-Modified + 304); sorgu ve context processor çalışmaz. Giriş yapmış
+    kullanıcılar ve bekleyen flash mesajı olan oturumlar dinamik render'a
+    düşer. Page veya Category (menü) değişen her commit sonrası dosyalar
+    yeniden yazılır.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PRERENDER_FOLDER', os.path.join(app.instance_path, 'pages'))
+        app.config.setdefault('PRERENDER_ENABLED', True)
+        app.extensions['prerender'] = self
+
+    def prerendered(self, view):
+        """View'ı önceden render edilen sayfalara ekle"""
+        @wraps(view)
+        def decorated_function(*args, **kwargs):
+            if (not current_app.config['PRERENDER_ENABLED'] or request.method != 'GET'
+                    or current_user.is_authenticated or session.get('_flashes')):
+                return view(*args, **kwargs)
+            return self.send(request.endpoint)
+        decorated_function.prerendered_view = view
+        return decorated_function
+
+    # ----- servis -----
+
+    def send(self, endpoint):
+        """Render edilmiş dosyayı gönder; henüz yoksa önce render et"""
+        folder = current_app.config['PRERENDER_FOLDER']
+        filename = f'{endpoint}.html'
+        if not os.path.exists(os.path.join(folder, filename)):
+            self.render(endpoint)
+        # max_age=0: tarayıcı her seferinde ETag ile doğrular, admin değişikliği hemen görünür
+        return send_from_directory(folder, filename, mimetype='text/html', max_age=0)
+
+    # ----- üretim -----
+
+    def endpoints(self):
+        return sorted(endpoint for endpoint, view in current_app.view_functions.items()
+                      if hasattr(view, 'prerendered_view'))
+
+    def render_all(self):
+        for endpoint in self.endpoints():
+            try:
+                self.render(endpoint)
+            except Exception:
+                # Dosya silinir; bir sonraki anonim istek yeniden dener
+                logger.exception('%s önceden render edilemedi', endpoint)
+                self._remove(f'{endpoint}.html')
+
+    def render(self, endpoint):
+        """Sayfayı anonim ziyaretçinin göreceği haliyle render edip diske yaz"""
+        app = current_app._get_current_object()
+        view = app.view_functions[endpoint].prerendered_view
+        path = app.url_map.bind('localhost').build(endpoint)
+        # Yeni app context: admin isteği içinden çağrılsa bile oturum, `g` ve
+        # SQLAlchemy session'ı paylaşılmaz, sayfa anonim olarak render edilir
+        with app.app_context(), app.test_request_context(path, base_url=app.config.get('SITE_URL')):
+            response = app.make_response(view())
+        if response.status_code != 200:
+            self._remove(f'{endpoint}.html')
+            return
+        self._write(f'{endpoint}.html', response.get_data())
+
+    def _write(self, filename, body):
+        write_atomic(os.path.join(current_app.config['PRERENDER_FOLDER'], filename), body)
+
+    def _remove(self, filename):
+        remove_file(os.path.join(current_app.config['PRERENDER_FOLDER'], filename))
+
+
+# ----- değişiklik takibi -----
+
+def _collect_changes(session, objects):
+    # Kategoriler her sayfanın menüsünde, Page içerikleri sayfanın kendisinde
+    if any(isinstance(obj, (Page, Category)) for obj in objects):
+        session.info['prerender_stale'] = True
+
+
+track_changes('prerender_stale', 'prerender', _collect_changes, lambda renderer, stale: renderer.render_all())
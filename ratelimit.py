@@ -0,0 +1,234 @@
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from functools import wraps
+from flask import current_app, request
+from flask_login import current_user
+from werkzeug.exceptions import TooManyRequests
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_limit(limit):
+    """'5/minute' -> (kapasite, saniye başına dolum hızı)"""
+    count, _, period = limit.partition('/')
+    period = period.strip().lower().rstrip('s')
+    if period not in PERIODS:
+        raise ValueError(f'Geçersiz rate limit: {limit!r}')
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period]
+
+
+def _refill(buckets, states, now):
+    """Bucket'ları doldur; hepsinde token varsa her birinden bir tane düş.
+
+    buckets: [(key, kapasite, dolum hızı)], states: [(tokens, updated)].
+    Biri boşsa hiçbirinden düşülmez (reddedilen istek diğer limitleri
+    harcamaz) ve en uzun bekleme süresi döner.
+    """
+    tokens = [min(capacity, current + (now - updated) * rate)
+              for (_, capacity, rate), (current, updated) in zip(buckets, states)]
+    waits = [(1 - current) / rate for (_, _, rate), current in zip(buckets, tokens) if current < 1]
+    if waits:
+        return tokens, max(waits)
+    return [current - 1 for current in tokens], 0.0
+
+
+class MemoryStore:
+    """Süreç içi token bucket deposu (her gunicorn worker'ı için ayrı)"""
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def consume(self, buckets, now):
+        with self._lock:
+            states = [self._buckets.get(key, (capacity, now)) for key, capacity, _ in buckets]
+            tokens, retry_after = _refill(buckets, states, now)
+            for (key, _, _), current in zip(buckets, tokens):
+                self._buckets[key] = (current, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+        return retry_after
+
+    def _prune(self, now):
+        # Dolmuş (boşta kalmış) bucket'lar varsayılanla aynıdır, silinebilir
+        for key in [k for k, (tokens, updated) in self._buckets.items() if now - updated > 3600]:
+            del self._buckets[key]
+        while len(self._buckets) > self.max_keys:
+            self._buckets.pop(next(iter(self._buckets)))
+
+
+class SQLiteStore:
+    """Aynı makinedeki tüm worker'ların paylaştığı SQLite deposu"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')  # geçici durum, dayanıklılık gerekmez
+            conn.execute('CREATE TABLE IF NOT EXISTS buckets '
+                         '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)')
+            self._local.conn = conn
+        return conn
+
+    def consume(self, buckets, now):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            states = []
+            for key, capacity, _ in buckets:
+                row = conn.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+                states.append(row if row else (capacity, now))
+            tokens, retry_after = _refill(buckets, states, now)
+            conn.executemany('INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                             [(key, current, now) for (key, _, _), current in zip(buckets, tokens)])
+            if random.random() < 0.001:
+                conn.execute('DELETE FROM buckets WHERE updated < ?', (now - 86400,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return retry_after
+
+
+class RedisStore:
+    """Redis (veya protokol uyumlu) sunucu üzerinde atomik Lua script ile"""
+
+    # ARGV: now, sonra her KEYS[i] için kapasite ve dolum hızı
+    SCRIPT = '''
+local now = tonumber(ARGV[1])
+local tokens = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local bucket = redis.call('HMGET', key, 'tokens', 'updated')
+    local current = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens[i] = math.min(capacity, current + (now - updated) * rate)
+    if tokens[i] < 1 then
+        wait = math.max(wait, (1 - tokens[i]) / rate)
+    end
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    if wait == 0 then
+        tokens[i] = tokens[i] - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens[i]), 'updated', tostring(now))
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+end
+return tostring(wait)
+'''
+
+    def __init__(self, url):
+        import redis  # opsiyonel bağımlılık
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def consume(self, buckets, now):
+        args = [now]
+        for _, capacity, rate in buckets:
+            args += [capacity, rate]
+        return float(self._script(keys=[f'ratelimit:{key}' for key, _, _ in buckets], args=args))
+
+
+def create_store(url):
+    """RATELIMIT_STORAGE_URL: memory://, sqlite:///yol/dosya.db veya redis://..."""
+    if url.startswith('memory://'):
+        return MemoryStore()
+    if url.startswith('sqlite:///'):
+        path = url[len('sqlite:///'):]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return SQLiteStore(path)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisStore(url)
+    raise ValueError(f'Desteklenmeyen rate limit deposu: {url!r}')
+
+
+class RateLimiter:
+    """Route bazında per-IP / per-user token bucket rate limit.
+
+    Limitler decorator ile verilir, `RATELIMITS` config'i ile ezilebilir.
+    Anahtar `endpoint:per` ise sadece o bucket, `endpoint` ise endpoint'in
+    tüm bucket'ları değişir:
+    {'main.add_comment:user': '10/minute', 'main.login': '10/minute'}.
+
+    IP `request.remote_addr`'dır; proxy arkasında `TRUSTED_PROXY_COUNT` ile
+    X-Forwarded-For'dan gelen gerçek istemci adresi kullanılır.
+    """
+
+    def __init__(self, app=None):
+        self._overrides = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RATELIMIT_ENABLED', True)
+        app.config.setdefault('RATELIMIT_STORAGE_URL', 'memory://')
+        app.config.setdefault('RATELIMITS', {})
+        # Bağlantılar ilk kullanımda açılır (preload_app/fork güvenli)
+        app.extensions['ratelimit'] = create_store(app.config['RATELIMIT_STORAGE_URL'])
+
+    def limit(self, limit, per='ip', methods=None):
+        """View decorator. per: 'ip' veya 'user' (anonimse IP'ye düşer).
+
+        Üst üste verilen limitler tek adımda uygulanır: biri aşılmışsa hiçbir
+        bucket'tan token düşülmez, Retry-After en uzun bekleme süresidir.
+        """
+        rule = (parse_limit(limit), per, {m.upper() for m in methods} if methods else None)
+
+        def decorator(f):
+            rules = getattr(f, 'ratelimit_rules', None)
+            if rules is not None:
+                rules.append(rule)  # alttaki limit decorator'ının wrapper'ı kullanılır
+                return f
+            rules = [rule]
+
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                if not current_app.config['RATELIMIT_ENABLED']:
+                    return f(*args, **kwargs)
+                buckets = [self._bucket(rule_default, rule_per, request.endpoint)
+                           for rule_default, rule_per, rule_methods in rules
+                           if not rule_methods or request.method in rule_methods]
+                if buckets:
+                    retry_after = current_app.extensions['ratelimit'].consume(buckets, time.time())
+                    if retry_after:
+                        raise TooManyRequests(
+                            'Çok fazla istek gönderdiniz, lütfen biraz sonra tekrar deneyin.',
+                            retry_after=math.ceil(retry_after))
+                return f(*args, **kwargs)
+            decorated_function.ratelimit_rules = rules
+            return decorated_function
+        return decorator
+
+    def _bucket(self, default, per, endpoint):
+        """(key, kapasite, dolum hızı); RATELIMITS ezmeleri burada uygulanır"""
+        limits = current_app.config['RATELIMITS']
+        override = limits.get(f'{endpoint}:{per}', limits.get(endpoint))
+        if override is None:
+            capacity, rate = default
+        else:
+            if override not in self._overrides:
+                self._overrides[override] = parse_limit(override)
+            capacity, rate = self._overrides[override]
+
+        if per == 'user' and current_user.is_authenticated:
+            key = f'{endpoint}:{per}:{current_user.id}'
+        else:
+            key = f'{endpoint}:{per}:{request.remote_addr}'
+        return key, capacity, rate
@@ -0,0 +1,151 @@
+import os
+import re
+import threading
+import unicodedata
+import uuid
+from collections import namedtuple
+from flask import current_app
+from sqlalchemy import event, inspect, or_, select, update
+from sqlalchemy.orm import Session
+from models import db, Category, Recipe
+from artifacts import track_changes, write_atomic
+
+# NFKD Türkçe harflerin hepsini ayrıştıramaz (ı, İ); önce elle çevrilir
+_TURKISH = str.maketrans('ıİIğĞşŞçÇöÖüÜ', 'iiiggssccoouu')
+
+# /recipe/add ve /recipe/<int:recipe_id> ile çakışmasın
+RESERVED_RECIPE_SLUGS = {'add'}
+
+_Table = namedtuple('_Table', 'version categories recipes recipe_slugs')
+
+
+def slugify(value, max_length=200):
+    """Türkçe harfleri ASCII karşılıklarına çevirip URL parçası üret: 'Çorbalar' -> 'corbalar'"""
+    value = unicodedata.normalize('NFC', value or '').translate(_TURKISH)
+    value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii').lower()
+    return re.sub(r'[^a-z0-9]+', '-', value).strip('-')[:max_length].rstrip('-')
+
+
+def _recipe_slug_base(title):
+    base = slugify(title) or 'tarif'
+    if base.isdigit() or base in RESERVED_RECIPE_SLUGS:
+        base = f'tarif-{base}'
+    return base
+
+
+def _free_slug(base, existing):
+    slug, suffix = base, 2
+    while slug in existing:
+        slug, suffix = f'{base}-{suffix}', suffix + 1
+    return slug
+
+
+def unique_recipe_slug(session, title, taken=()):
+    """Başlıktan slug üret; kullanılıyorsa -2, -3 ... ekle"""
+    base = _recipe_slug_base(title)
+    with session.no_autoflush:
+        existing = set(session.scalars(
+            select(Recipe.slug).where(or_(Recipe.slug == base, Recipe.slug.like(f'{base}-%')))))
+    existing.update(taken)
+    return _free_slug(base, existing)
+
+
+def backfill_recipe_slugs(session, batch_size=5000):
+    """slug sütunu eklenmeden önceki tariflere slug ver, doldurulan tarif sayısını döndür.
+
+    Kullanılan slug'lar bir kez okunur, çakışmalar bellekte çözülür (tarif
+    başına sorgu yok). Toplu UPDATE flush event'lerini tetiklemez; slug
+    tablosu ve akışlar çağıran tarafından yenilenir.
+    """
+    existing = set(session.scalars(select(Recipe.slug).where(Recipe.slug.is_not(None))))
+    rows = session.execute(select(Recipe.id, Recipe.title).where(Recipe.slug.is_(None)).order_by(Recipe.id)).all()
+    for offset in range(0, len(rows), batch_size):
+        values = []
+        for recipe_id, title in rows[offset:offset + batch_size]:
+            slug = _free_slug(_recipe_slug_base(title), existing)
+            existing.add(slug)
+            values.append({'id': recipe_id, 'slug': slug})
+        session.execute(update(Recipe), values)
+    return len(rows)
+
+
+class SlugRouter:
+    """Kategori ve tarif slug'larını bellekteki sözlüklerle id'ye çözer.
+
+    Tablo ilk kullanımda iki Core select ile kurulur; sonraki çözümlemeler
+    sorgusuz sözlük aramasıdır. Slug'ı etkileyen her commit sonrası
+    `ROUTING_VERSION_FILE` yeni bir değerle yazılır; her worker aramadan önce
+    bu dosyayı okur ve sürüm değişmişse tablosunu yeniden kurar.
+    """
+
+    def __init__(self, app=None):
+        self._tables = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('ROUTING_VERSION_FILE', os.path.join(app.instance_path, 'routing.version'))
+        app.extensions['routing'] = self
+
+    def category_id(self, slug):
+        return self._table().categories.get(slug)
+
+    def recipe_id(self, slug):
+        return self._table().recipes.get(slug)
+
+    def recipe_slug(self, recipe_id):
+        return self._table().recipe_slugs.get(recipe_id)
+
+    def invalidate(self):
+        """Tüm worker'ların tablosunu geçersiz kıl (yeni sürüm yaz)"""
+        write_atomic(current_app.config['ROUTING_VERSION_FILE'], uuid.uuid4().hex.encode('ascii'))
+
+    def _version(self):
+        try:
+            with open(current_app.config['ROUTING_VERSION_FILE']) as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _table(self):
+        app = current_app._get_current_object()
+        version = self._version()
+        table = self._tables.get(app)
+        if table is not None and table.version == version:
+            return table
+        with self._lock:
+            table = self._tables.get(app)
+            if table is None or table.version != version:
+                # Sürüm select'ten önce okunur: arada gelen değişiklik bir sonraki aramada yakalanır
+                with db.engine.connect() as conn:
+                    categories = dict(conn.execute(select(Category.slug, Category.id)).all())
+                    recipes = dict(conn.execute(select(Recipe.slug, Recipe.id)).all())
+                table = _Table(version, categories, recipes,
+                               {recipe_id: slug for slug, recipe_id in recipes.items()})
+                self._tables[app] = table
+        return table
+
+
+# ----- değişiklik takibi -----
+
+@event.listens_for(Session, 'before_flush')
+def _assign_recipe_slugs(session, flush_context, instances):
+    # Slug oluşturulurken bir kez atanır; başlık değişse de URL sabit kalır
+    taken = set()
+    for obj in session.new:
+        if isinstance(obj, Recipe) and not obj.slug:
+            obj.slug = unique_recipe_slug(session, obj.title, taken)
+            taken.add(obj.slug)
+
+
+def _collect_changes(session, objects):
+    # Toplu (Core) silinen tarifler tabloda kalabilir; id'leri zaten 404 döner
+    for obj in objects:
+        if isinstance(obj, (Recipe, Category)) and (
+                obj in session.new or obj in session.deleted or inspect(obj).attrs.slug.history.deleted):
+            session.info['routing_stale'] = True
+            return
+
+
+track_changes('routing_stale', 'routing', _collect_changes, lambda router, stale: router.invalidate())
@@ -0,0 +1,158 @@
+import logging
+from sqlalchemy import UniqueConstraint, inspect
+from sqlalchemy.schema import AddConstraint, CreateTable
+from models import db
+from routing import backfill_recipe_slugs
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade_schema():
+    """Var olan veritabanını modellere yetiştir, yapılan değişiklikleri döndür.
+
+    `db.create_all()` sadece eksik tabloları oluşturur; eski tablolara sonradan
+    eklenen sütunlar, indeksler ve ON DELETE kuralları için bu adım gerekir.
+    Eksik sütunlar eklenir (recipes.slug başlıklardan doldurulur), ON DELETE
+    kuralı modelden farklı olan foreign key'ler düzeltilir (SQLite'ta tablo
+    yeniden kurularak), eksik indeksler ve unique kısıtlar unique indeks
+    olarak oluşturulur. Tekrar çalıştırmak güvenlidir.
+    """
+    changes = []
+    engine = db.engine
+    tables = db.metadata.sorted_tables
+
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        existing = set(inspector.get_table_names())
+        for table in tables:
+            if table.name not in existing:
+                continue
+            present = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in present:
+                    _add_column(conn, table, column)
+                    changes.append(f'{table.name}.{column.name} sütunu eklendi')
+
+    # Tablo yeniden kurulursa NOT NULL kopyalamada kontrol edilir; önce doldurulmalı
+    filled = backfill_recipe_slugs(db.session)
+    db.session.commit()
+    if filled:
+        changes.append(f'{filled} tarifin slug\'ı üretildi')
+
+    outdated = []
+    with engine.connect() as conn:
+        inspector = inspect(conn)
+        for table in tables:
+            if table.name in inspector.get_table_names() and _outdated_foreign_keys(inspector, table):
+                outdated.append(table)
+    if outdated:
+        if engine.dialect.name == 'sqlite':
+            _rebuild_sqlite_tables(engine, outdated)
+        else:
+            _replace_foreign_keys(engine, outdated)
+        changes.extend(f'{table.name} foreign key ON DELETE kuralları güncellendi' for table in outdated)
+
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in tables:
+            if table.name not in inspector.get_table_names():
+                continue
+            indexes = inspector.get_indexes(table.name)
+            names = {index['name'] for index in indexes}
+            for index in table.indexes:
+                if index.name not in names:
+                    index.create(conn)
+                    changes.append(f'{index.name} indeksi oluşturuldu')
+            # ALTER TABLE ADD COLUMN UNIQUE olamaz; sonradan eklenen unique sütunlar için
+            unique = {tuple(constraint['column_names']) for constraint in inspector.get_unique_constraints(table.name)}
+            unique.update(tuple(index['column_names']) for index in indexes if index['unique'])
+            for constraint in table.constraints:
+                if not isinstance(constraint, UniqueConstraint):
+                    continue
+                columns = tuple(column.name for column in constraint.columns)
+                if columns not in unique:
+                    _add_unique_index(conn, table, columns)
+                    changes.append(f'{table.name} ({", ".join(columns)}) unique indeksi oluşturuldu')
+
+    for change in changes:
+        logger.info(change)
+    return changes
+
+
+def _add_column(conn, table, column):
+    preparer = conn.dialect.identifier_preparer
+    ddl = f'ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} ' \
+          f'{column.type.compile(dialect=conn.dialect)}'
+    # Varsayılanı olmayan NOT NULL sütun dolu tabloya eklenemez; yeni satırlarda uygulama doldurur
+    if column.server_default is not None:
+        ddl += f" DEFAULT '{column.server_default.arg}'"
+        if not column.nullable:
+            ddl += ' NOT NULL'
+    conn.exec_driver_sql(ddl)
+
+
+def _add_unique_index(conn, table, columns):
+    preparer = conn.dialect.identifier_preparer
+    name = preparer.quote(f'uq_{table.name}_{"_".join(columns)}')
+    conn.exec_driver_sql(f'CREATE UNIQUE INDEX {name} ON {preparer.format_table(table)} '
+                         f'({", ".join(preparer.quote(column) for column in columns)})')
+
+
+def _outdated_foreign_keys(inspector, table):
+    reflected = {
+        (tuple(fk['constrained_columns']), fk['referred_table']): fk
+        for fk in inspector.get_foreign_keys(table.name)
+    }
+    outdated = []
+    for constraint in table.foreign_key_constraints:
+        fk = reflected.get((tuple(constraint.column_keys), constraint.referred_table.name))
+        current = ((fk or {}).get('options', {}).get('ondelete') or '').upper()
+        if current != (constraint.ondelete or '').upper():
+            outdated.append((constraint, fk))
+    return outdated
+
+
+def _rebuild_sqlite_tables(engine, tables):
+    """SQLite foreign key değiştiremez: yeni tablo + kopyala + eskisini sil + yeniden adlandır
+
+    SQLite belgelerindeki sıra izlenir; foreign_keys kapalıyken tek
+    transaction'da yapılır, sonunda foreign_key_check ile doğrulanır.
+    """
+    with engine.connect() as conn:
+        preparer = conn.dialect.identifier_preparer
+        conn.exec_driver_sql('PRAGMA foreign_keys=OFF')
+        conn.exec_driver_sql('BEGIN')
+        try:
+            for table in tables:
+                name = preparer.format_table(table)
+                temporary = preparer.quote(f'_new_{table.name}')
+                columns = ', '.join(preparer.quote(column['name'])
+                                    for column in inspect(conn).get_columns(table.name)
+                                    if column['name'] in table.columns)
+                ddl = str(CreateTable(table).compile(dialect=conn.dialect))
+                conn.exec_driver_sql(ddl.replace(f'CREATE TABLE {name} ', f'CREATE TABLE {temporary} ', 1))
+                conn.exec_driver_sql(f'INSERT INTO {temporary} ({columns}) SELECT {columns} FROM {name}')
+                conn.exec_driver_sql(f'DROP TABLE {name}')
+                conn.exec_driver_sql(f'ALTER TABLE {temporary} RENAME TO {name}')
+                for index in table.indexes:
+                    index.create(conn)
+            violations = conn.exec_driver_sql('PRAGMA foreign_key_check').all()
+            if violations:
+                raise RuntimeError(f'Yetim satırlar var, şema güncellenmedi: {violations[:5]}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.exec_driver_sql('PRAGMA foreign_keys=ON')
+
+
+def _replace_foreign_keys(engine, tables):
+    with engine.begin() as conn:
+        preparer = conn.dialect.identifier_preparer
+        for table in tables:
+            for constraint, fk in _outdated_foreign_keys(inspect(conn), table):
+                if fk is not None and fk.get('name'):
+                    conn.exec_driver_sql(f'ALTER TABLE {preparer.format_table(table)} '
+                                         f'DROP CONSTRAINT {preparer.quote(fk["name"])}')
+                conn.execute(AddConstraint(constraint))
@@ -1,13 +1,16 @@
-from app import app, db
-from models import User, Category, Recipe, Comment, Page
+from models import db, User, Category, Recipe, Comment, Page
 from datetime import datetime
 
-def seed_database():
+def seed_database(app=None, drop=True):
     """Veritabanına örnek veriler ekle"""
+    if app is None:
+        from app import create_app
+        app = create_app()
     
     with app.app_context():
         # Önce tüm tabloları temizle
-        db.drop_all()
+        if drop:
+            db.drop_all()
         db.create_all()
         
         print("Veritabanı tablolan oluşturuldu...")
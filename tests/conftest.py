@@ -0,0 +1,264 @@
+"""Performans regresyon testleri için ortak fixture'lar.
+
+Uygulama geçici bir SQLite dosyasına karşı, üretilmiş bir veri setiyle bir
+kere kurulur. Her ölçüm SQL ifade sayısını (cursor event'leri), ORM'in
+yüklediği satır sayısını (loaded_as_persistent) ve süreyi kaydeder; oturum
+sonunda tümü `--perf-report` ile verilen JSON dosyasına yazılır.
+
+Veri seti boyutu PERF_SCALE ile büyütülebilir (varsayılan 1), süre bütçeleri
+PERF_TIME_FACTOR ile gevşetilebilir (yavaş CI makineleri için).
+"""
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from werkzeug.security import generate_password_hash
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from models import db, User, Category, Recipe, Comment, Page, Image, recount_comment_stats  # noqa: E402
+
+SCALE = int(os.getenv('PERF_SCALE', 1))
+TIME_FACTOR = float(os.getenv('PERF_TIME_FACTOR', 1))
+PASSWORD = 'parola123'
+
+results_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    parser.addoption('--perf-report', default='perf-report.json',
+                     help='Route ölçümlerinin yazılacağı JSON dosyası')
+
+
+def pytest_configure(config):
+    config.stash[results_key] = {}
+
+
+def pytest_sessionfinish(session, exitstatus):
+    routes = session.config.stash.get(results_key, {})
+    if not routes:
+        return
+    report = {
+        'dataset': Dataset.counts(),
+        'time_factor': TIME_FACTOR,
+        'routes': routes,
+    }
+    path = session.config.getoption('--perf-report')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+
+
+@dataclass
+class Dataset:
+    """Üretilen veri setinde testlerin kullandığı sabit kayıtlar"""
+    admin_id: int
+    cook_id: int
+    other_id: int
+    category_id: int
+    category_slug: str
+    recipe_id: int          # cook'a ait, yorumlu ve galerili tarif
+    recipe_slug: str
+    other_recipe_id: int    # other'a ait tarif
+    page_id: int
+    totals: dict = field(default_factory=dict)
+
+    _counts = {}
+
+    @classmethod
+    def counts(cls):
+        return dict(cls._counts)
+
+
+def build_dataset():
+    """Core toplu INSERT ile ölçeklenebilir veri seti"""
+    rng = random.Random(1234)
+    now = datetime(2024, 1, 1)
+    password_hash = generate_password_hash(PASSWORD, method='pbkdf2:sha256')
+    n_users, n_recipes, n_comments = 50 * SCALE, 1000 * SCALE, 10000 * SCALE
+
+    users = [{'username': 'admin', 'is_admin': True}, {'username': 'cook', 'is_admin': False},
+             {'username': 'other', 'is_admin': False}]
+    users += [{'username': f'user{i}', 'is_admin': False} for i in range(n_users - len(users))]
+    for row in users:
+        row.update(password_hash=password_hash, created_at=now)
+    db.session.execute(User.__table__.insert(), users)
+
+    categories = [('Kahvaltı', 'kahvalti'), ('Öğle Yemeği', 'ogle-yemegi'), ('Akşam Yemeği', 'aksam-yemegi'),
+                  ('Tatlılar', 'tatlilar'), ('Çorbalar', 'corbalar'), ('Salatalar', 'salatalar')]
+    db.session.execute(Category.__table__.insert(), [
+        {'name': name, 'slug': slug, 'description': f'{name} tarifleri', 'created_at': now}
+        for name, slug in categories])
+
+    user_ids = list(range(1, n_users + 1))
+    recipes = [{
+        'title': f'Tarif {i}', 'slug': f'tarif-{i}', 'content': f'Tarif {i} açıklaması ' * 5,
+        'ingredients': 'un\nşeker\nyumurta', 'instructions': 'karıştır\npişir',
+        'prep_time': 10, 'cook_time': 20, 'servings': 4,
+        'category_id': 1 + i % len(categories),
+        # İlk iki tarif sabit hesaplara ait (Dataset.recipe_id / other_recipe_id)
+        'user_id': 2 if i == 0 else 3 if i == 1 else rng.choice(user_ids),
+        'created_at': now + timedelta(minutes=i), 'updated_at': now + timedelta(minutes=i),
+    } for i in range(n_recipes)]
+    for offset in range(0, len(recipes), 5000):
+        db.session.execute(Recipe.__table__.insert(), recipes[offset:offset + 5000])
+
+    # Yorumların bir kısmı tek tarifte yoğunlaşır (sayfalama yolunu ölçmek için)
+    comments = [{
+        'recipe_id': 1 if i % 10 == 0 else rng.randint(1, n_recipes),
+        'user_id': rng.choice(user_ids), 'body': f'Yorum {i}', 'rating': rng.randint(1, 5),
+        'created_at': now + timedelta(seconds=i),
+    } for i in range(n_comments)]
+    for offset in range(0, len(comments), 5000):
+        db.session.execute(Comment.__table__.insert(), comments[offset:offset + 5000])
+
+    db.session.execute(Image.__table__.insert(), [
+        {'filename': f'galeri-{recipe_id}-{position}.jpg', 'recipe_id': recipe_id, 'position': position,
+         'width': 4, 'height': 3, 'created_at': now}
+        for recipe_id in range(1, n_recipes + 1, 10) for position in range(3)])
+
+    db.session.execute(Page.__table__.insert(), [
+        {'slug': 'about', 'title': 'Hakkımızda', 'content': 'Biz kimiz?', 'created_at': now, 'updated_at': now},
+        {'slug': 'contact', 'title': 'İletişim', 'content': 'Bize ulaşın', 'created_at': now, 'updated_at': now},
+    ])
+    recount_comment_stats()
+    db.session.commit()
+
+    Dataset._counts = {
+        'users': n_users, 'categories': len(categories), 'recipes': n_recipes,
+        'comments': n_comments, 'images': db.session.query(Image).count(), 'pages': 2,
+    }
+    return Dataset(admin_id=1, cook_id=2, other_id=3, category_id=1, category_slug='kahvalti',
+                   recipe_id=1, recipe_slug='tarif-0', other_recipe_id=2, page_id=1, totals=Dataset.counts())
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    root = tmp_path_factory.mktemp('perf')
+    app = create_app({
+        'TESTING': True,
+        'SECRET_KEY': 'test',
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{root / "test.db"}',
+        'UPLOAD_FOLDER': str(root / 'uploads'),
+        'FEEDS_FOLDER': str(root / 'feeds'),
+        'FEEDS_ASYNC': False,  # commit sonrası üretim ölçüme dahil ve deterministik
+        'PRERENDER_FOLDER': str(root / 'pages'),
+        'ROUTING_VERSION_FILE': str(root / 'routing.version'),
+        'EVENTS_FANOUT_DIR': str(root / 'events'),
+        'JINJA_BYTECODE_CACHE_DIR': str(root / 'jinja'),
+        'RATELIMIT_ENABLED': False,
+        'SSE_MAX_DURATION': 0,  # akış ilk paketten sonra kapanır
+    })
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@pytest.fixture(scope='session')
+def dataset(app):
+    with app.app_context():
+        return build_dataset()
+
+
+@pytest.fixture
+def client(app, dataset):
+    return app.test_client()
+
+
+def login(client, username):
+    response = client.post('/login', data={'username': username, 'password': PASSWORD})
+    assert response.status_code == 302, f'{username} giriş yapamadı'
+    return client
+
+
+@pytest.fixture
+def cook_client(client):
+    return login(client, 'cook')
+
+
+@pytest.fixture
+def admin_client(client):
+    return login(client, 'admin')
+
+
+@dataclass
+class Budget:
+    statements: int
+    rows: int
+    ms: float
+
+
+class QueryMeter:
+    """Bir istek boyunca SQL ifadelerini ve ORM'in yüklediği satırları say"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+        self.rows = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _on_load(self, session, instance):
+        self.rows += 1
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        event.listen(Session, 'loaded_as_persistent', self._on_load)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+        event.remove(Session, 'loaded_as_persistent', self._on_load)
+
+
+@pytest.fixture
+def measure(app, request):
+    """İsteği ölç, rapora ekle ve bütçeyi doğrula.
+
+    measure(client, 'GET', '/', Budget(...), endpoint='main.index', status=200)
+    """
+    routes = request.config.stash[results_key]
+
+    def run(client, method, path, budget, endpoint, status=200, warmup=None, **kwargs):
+        if warmup is None:
+            warmup = method == 'GET'
+        if warmup:
+            # İlk istek template derleme maliyetini taşır, ölçülmez
+            client.open(path, method=method, **kwargs).close()
+        with app.app_context():
+            engine = db.engine
+        with QueryMeter(engine) as meter:
+            started = time.perf_counter()
+            response = client.open(path, method=method, **kwargs)
+            response.get_data()
+            response.close()  # WSGI sunucusu gibi: call_on_close kancaları çalışır
+            elapsed = (time.perf_counter() - started) * 1000
+
+        ms_budget = budget.ms * TIME_FACTOR
+        routes[f'{method} {endpoint}'] = {
+            'path': path,
+            'status': response.status_code,
+            'statements': len(meter.statements),
+            'rows': meter.rows,
+            'ms': round(elapsed, 2),
+            'budget': {'statements': budget.statements, 'rows': budget.rows, 'ms': ms_budget},
+        }
+        assert response.status_code == status, response.get_data(as_text=True)[:500]
+        assert len(meter.statements) <= budget.statements, \
+            f'{endpoint}: {len(meter.statements)} SQL ifadesi (bütçe {budget.statements})\n' + \
+            '\n'.join(meter.statements)
+        assert meter.rows <= budget.rows, f'{endpoint}: {meter.rows} satır yüklendi (bütçe {budget.rows})'
+        assert elapsed <= ms_budget, f'{endpoint}: {elapsed:.1f}ms (bütçe {ms_budget:.0f}ms)'
+        return response
+
+    return run
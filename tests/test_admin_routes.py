@@ -0,0 +1,204 @@
+import threading
+
+import pytest
+
+from conftest import Budget, SCALE
+from deletion import delete_user
+from models import db, User, Category, Recipe, Comment, Page
+
+
+@pytest.fixture
+def victim(app, dataset):
+    """Silinecek kullanıcı: birkaç tarif ve başka tariflere yorumlar"""
+    with app.app_context():
+        user = User(username='silinecek')
+        user.set_password('x')
+        db.session.add(user)
+        db.session.flush()
+        for i in range(3):
+            db.session.add(Recipe(title=f'Silinecek {i}', content='x', category_id=dataset.category_id,
+                                  user_id=user.id))
+        db.session.add_all([Comment(recipe_id=dataset.recipe_id, user_id=user.id, body='x', rating=3)
+                            for _ in range(5)])
+        db.session.commit()
+        return user.id
+
+
+@pytest.fixture
+def empty_category(app):
+    with app.app_context():
+        category = Category(name='Boş', slug='bos')
+        db.session.add(category)
+        db.session.commit()
+        return category.id
+
+
+@pytest.fixture
+def comment_id(app, dataset):
+    with app.app_context():
+        comment = Comment(recipe_id=dataset.recipe_id, user_id=dataset.other_id, body='Spam', rating=1)
+        db.session.add(comment)
+        db.session.commit()
+        return comment.id
+
+
+@pytest.fixture
+def page_id(app, request):
+    with app.app_context():
+        page = Page(slug=request.node.name.replace('_', '-'), title='Geçici', content='x')
+        db.session.add(page)
+        db.session.commit()
+        return page.id
+
+
+def test_dashboard(admin_client, measure):
+    measure(admin_client, 'GET', '/admin', Budget(statements=6, rows=10, ms=100), 'admin.dashboard')
+
+
+def test_anonymous_redirected(client, measure):
+    measure(client, 'GET', '/admin', Budget(statements=0, rows=0, ms=50), 'admin.dashboard:anonymous',
+            status=302)
+
+
+def test_recipes(admin_client, dataset, measure):
+    # Liste tüm tarifleri gösterir; yazar ve kategori aynı sorguda gelir (N+1 yok)
+    totals = dataset.totals
+    measure(admin_client, 'GET', '/admin/recipes',
+            Budget(statements=3, rows=totals['recipes'] + totals['users'] + 50, ms=300 * SCALE), 'admin.recipes')
+
+
+def test_delete_recipe(admin_client, dataset, app, measure):
+    with app.app_context():
+        recipe = Recipe(title='Admin siler', content='x', category_id=dataset.category_id, user_id=dataset.other_id)
+        db.session.add(recipe)
+        db.session.commit()
+        recipe_id = recipe.id
+    measure(admin_client, 'POST', f'/admin/recipes/{recipe_id}/delete', Budget(statements=11, rows=5, ms=300),
+            'admin.delete_recipe', status=302)
+
+
+def test_categories(admin_client, measure):
+    measure(admin_client, 'GET', '/admin/categories', Budget(statements=4, rows=20, ms=100), 'admin.categories')
+
+
+def test_add_category_form(admin_client, measure):
+    measure(admin_client, 'GET', '/admin/categories/add', Budget(statements=2, rows=10, ms=50),
+            'admin.add_category')
+
+
+def test_add_category(admin_client, measure):
+    # Commit sonrası menüyü içeren önceden render edilmiş sayfalar da yeniden yazılır
+    measure(admin_client, 'POST', '/admin/categories/add', Budget(statements=12, rows=20, ms=300),
+            'admin.add_category', status=302,
+            data={'name': 'Mezeler', 'slug': 'mezeler', 'description': 'Meze tarifleri'})
+
+
+def test_edit_category_form(admin_client, dataset, measure):
+    measure(admin_client, 'GET', f'/admin/categories/{dataset.category_id}/edit',
+            Budget(statements=3, rows=10, ms=50), 'admin.edit_category')
+
+
+def test_edit_category(admin_client, empty_category, measure):
+    measure(admin_client, 'POST', f'/admin/categories/{empty_category}/edit',
+            Budget(statements=13, rows=20, ms=300), 'admin.edit_category', status=302,
+            data={'name': 'Dolu', 'slug': 'dolu', 'description': 'x'})
+
+
+def test_delete_category(admin_client, empty_category, measure):
+    measure(admin_client, 'POST', f'/admin/categories/{empty_category}/delete',
+            Budget(statements=12, rows=20, ms=300), 'admin.delete_category', status=302)
+
+
+def test_delete_category_in_use(admin_client, dataset, measure):
+    # Tarifi olan kategori silinmez; kontrol tarifleri yüklemeden yapılır
+    measure(admin_client, 'POST', f'/admin/categories/{dataset.category_id}/delete',
+            Budget(statements=4, rows=5, ms=100), 'admin.delete_category:in-use', status=302)
+
+
+def test_users(admin_client, dataset, measure):
+    measure(admin_client, 'GET', '/admin/users',
+            Budget(statements=5, rows=dataset.totals['users'] + 20, ms=100 * SCALE), 'admin.users')
+
+
+def test_toggle_user_admin(admin_client, dataset, measure):
+    measure(admin_client, 'POST', f'/admin/users/{dataset.other_id}/toggle-admin',
+            Budget(statements=4, rows=5, ms=100), 'admin.toggle_user_admin', status=302)
+    admin_client.post(f'/admin/users/{dataset.other_id}/toggle-admin')
+
+
+def test_delete_user(admin_client, victim, dataset, app, measure):
+    measure(admin_client, 'POST', f'/admin/users/{victim}/delete', Budget(statements=16, rows=5, ms=300),
+            'admin.delete_user', status=302)
+    with app.app_context():
+        assert db.session.get(User, victim) is None
+        recipe = db.session.get(Recipe, dataset.recipe_id)
+        assert recipe.comment_count == Comment.query.filter_by(recipe_id=recipe.id).count()
+
+
+def test_comments(admin_client, dataset, measure):
+    # Tüm yorumlar listelenir; kullanıcı ve tarif aynı sorguda gelir (N+1 yok)
+    totals = dataset.totals
+    measure(admin_client, 'GET', '/admin/comments',
+            Budget(statements=3, rows=totals['comments'] + totals['recipes'] + totals['users'] + 100,
+                   ms=3000 * SCALE),
+            'admin.comments')
+
+
+def test_delete_comment(admin_client, comment_id, measure):
+    measure(admin_client, 'POST', f'/admin/comments/{comment_id}/delete', Budget(statements=5, rows=5, ms=100),
+            'admin.delete_comment', status=302)
+
+
+def test_pages(admin_client, measure):
+    measure(admin_client, 'GET', '/admin/pages', Budget(statements=3, rows=20, ms=50), 'admin.pages')
+
+
+def test_add_page_form(admin_client, measure):
+    measure(admin_client, 'GET', '/admin/pages/add', Budget(statements=2, rows=10, ms=50), 'admin.add_page')
+
+
+def test_add_page(admin_client, measure):
+    # Hakkımızda ve İletişim dosyaları commit sonrası yeniden render edilir (3 sorgu)
+    measure(admin_client, 'POST', '/admin/pages/add', Budget(statements=7, rows=20, ms=100),
+            'admin.add_page', status=302, data={'slug': 'sss', 'title': 'SSS', 'content': 'Sorular'})
+
+
+def test_edit_page_form(admin_client, dataset, measure):
+    measure(admin_client, 'GET', f'/admin/pages/{dataset.page_id}/edit', Budget(statements=3, rows=10, ms=50),
+            'admin.edit_page')
+
+
+def test_edit_page(admin_client, page_id, measure):
+    measure(admin_client, 'POST', f'/admin/pages/{page_id}/edit', Budget(statements=7, rows=20, ms=100),
+            'admin.edit_page', status=302, data={'slug': 'duzenlendi', 'title': 'Geçici 2', 'content': 'y'})
+
+
+def test_edit_about_page_rerenders(admin_client, client, dataset):
+    admin_client.post(f'/admin/pages/{dataset.page_id}/edit',
+                      data={'slug': 'about', 'title': 'Biz Kimiz', 'content': 'Yeni içerik'})
+    assert 'Biz Kimiz' in client.get('/about').get_data(as_text=True)
+
+
+def test_delete_page(admin_client, page_id, measure):
+    measure(admin_client, 'POST', f'/admin/pages/{page_id}/delete', Budget(statements=7, rows=20, ms=100),
+            'admin.delete_page', status=302)
+
+
+def test_delete_user_counts_comments_on_owned_recipes(app, dataset, monkeypatch):
+    # Tek tarif ama üzerinde çok yorum: cascade hepsini siler, arka plana bırakılmalı
+    with app.app_context():
+        user = User(username='populer')
+        user.set_password('x')
+        recipe = Recipe(title='Popüler', content='x', category_id=dataset.category_id, author=user)
+        db.session.add_all([user, recipe] + [Comment(recipe=recipe, user_id=dataset.other_id, body='x')
+                                             for _ in range(5)])
+        db.session.commit()
+        user_id = user.id
+        monkeypatch.setitem(app.config, 'USER_DELETE_SYNC_LIMIT', 5)
+        with app.test_request_context():
+            assert delete_user(user) is False
+        for thread in threading.enumerate():
+            if thread.name == f'purge-user-{user_id}':
+                thread.join()
+        db.session.expire_all()
+        assert db.session.get(User, user_id) is None
@@ -0,0 +1,32 @@
+from conftest import Budget, PASSWORD, login
+
+
+def test_register_form(client, measure):
+    measure(client, 'GET', '/register', Budget(statements=1, rows=10, ms=50), 'main.register')
+
+
+def test_register(client, measure):
+    # Parola hash'i (pbkdf2) bilinçli olarak yavaştır; süre bütçesi buna göre
+    measure(client, 'POST', '/register',
+            Budget(statements=3, rows=0, ms=1000), 'main.register', status=302,
+            data={'username': 'yeni_uye', 'password': 'parola', 'password_confirm': 'parola'})
+
+
+def test_login_form(client, measure):
+    measure(client, 'GET', '/login', Budget(statements=1, rows=10, ms=50), 'main.login')
+
+
+def test_login(client, measure):
+    measure(client, 'POST', '/login', Budget(statements=1, rows=1, ms=1000), 'main.login', status=302,
+            data={'username': 'cook', 'password': PASSWORD})
+
+
+def test_login_wrong_password(client, measure):
+    measure(client, 'POST', '/login', Budget(statements=2, rows=10, ms=1000), 'main.login:failed',
+            data={'username': 'cook', 'password': 'yanlis'})
+
+
+def test_logout(client, measure):
+    login(client, 'cook')
+    measure(client, 'GET', '/logout', Budget(statements=1, rows=1, ms=50), 'main.logout', status=302,
+            warmup=False)
@@ -0,0 +1,125 @@
+from conftest import Budget, SCALE
+
+
+def test_index(client, measure):
+    measure(client, 'GET', '/', Budget(statements=4, rows=40, ms=150), 'main.index')
+
+
+def test_category(client, dataset, measure):
+    # Kategori sayfası tüm tariflerini listeler; satır bütçesi veri setiyle büyür
+    per_category = dataset.totals['recipes'] // dataset.totals['categories'] + 1
+    measure(client, 'GET', f'/category/{dataset.category_slug}',
+            Budget(statements=4, rows=per_category * 2 + 20, ms=100 * SCALE), 'main.category')
+
+
+def test_category_not_found(client, measure):
+    # Slug bellekteki tablodan çözülür; olmayan kategori için kategori sorgusu yok
+    measure(client, 'GET', '/category/yok', Budget(statements=1, rows=10, ms=100),
+            'main.category:not-found', status=404)
+
+
+def test_category_turkish_slug_redirects(client, measure):
+    response = measure(client, 'GET', '/category/Kahvaltı', Budget(statements=0, rows=0, ms=50),
+                       'main.category:canonical-redirect', status=301)
+    assert response.headers['Location'].endswith('/category/kahvalti')
+
+
+def test_recipe_detail(client, dataset, measure):
+    measure(client, 'GET', f'/recipe/{dataset.recipe_slug}', Budget(statements=7, rows=60, ms=150),
+            'main.recipe_detail')
+
+
+def test_recipe_by_id_redirects(client, dataset, measure):
+    # Eski sayısal adres: id -> slug sözlükten, sorgusuz 301
+    response = measure(client, 'GET', f'/recipe/{dataset.recipe_id}', Budget(statements=0, rows=0, ms=50),
+                       'main.recipe_by_id', status=301)
+    assert response.headers['Location'].endswith(f'/recipe/{dataset.recipe_slug}')
+
+
+def test_recipe_not_found(client, measure):
+    measure(client, 'GET', '/recipe/yok-boyle-tarif', Budget(statements=1, rows=10, ms=50),
+            'main.recipe_detail:not-found', status=404)
+
+
+def test_more_comments(client, dataset, measure):
+    page = client.get(f'/recipe/{dataset.recipe_slug}').get_data(as_text=True)
+    cursor = page.split('data-cursor="')[1].split('"')[0]
+    response = measure(client, 'GET', f'/recipe/{dataset.recipe_id}/comments?cursor={cursor}',
+                       Budget(statements=2, rows=45, ms=100), 'main.more_comments')
+    assert response.json['html']
+
+
+def test_more_comments_bad_cursor(client, dataset, measure):
+    measure(client, 'GET', f'/recipe/{dataset.recipe_id}/comments?cursor=bozuk',
+            Budget(statements=0, rows=0, ms=50), 'main.more_comments:bad-cursor', status=400)
+
+
+def test_comment_stream(client, dataset, measure):
+    response = measure(client, 'GET', f'/recipe/{dataset.recipe_id}/comments/stream',
+                       Budget(statements=1, rows=1, ms=50), 'main.comment_stream')
+    assert response.mimetype == 'text/event-stream'
+
+
+def test_comment_stream_limit(client, dataset, app, monkeypatch):
+    # Kota doluyken akış açılmaz (204, EventSource yeniden denemez); kapanan akış kotayı geri verir
+    monkeypatch.setitem(app.config, 'SSE_MAX_STREAMS', 1)
+    path = f'/recipe/{dataset.recipe_id}/comments/stream'
+    first = client.get(path, buffered=False)
+    assert first.status_code == 200
+    assert client.get(path).status_code == 204
+    first.close()
+    assert client.get(path).status_code == 200
+
+
+def test_comment_stream_disabled(client, dataset, app, monkeypatch):
+    monkeypatch.setitem(app.config, 'SSE_MAX_STREAMS', 0)
+    assert client.get(f'/recipe/{dataset.recipe_id}/comments/stream').status_code == 204
+    assert 'EventSource && false' in client.get(f'/recipe/{dataset.recipe_slug}').get_data(as_text=True)
+
+
+def test_about(client, measure):
+    # Anonim ziyaretçiye önceden render edilmiş dosya: sorgu yok, ETag ile 304
+    response = measure(client, 'GET', '/about', Budget(statements=0, rows=0, ms=50), 'main.about')
+    measure(client, 'GET', '/about', Budget(statements=0, rows=0, ms=50), 'main.about:not-modified',
+            status=304, headers={'If-None-Match': response.headers['ETag']})
+
+
+def test_about_authenticated(cook_client, measure):
+    # Giriş yapmış kullanıcı menüsünü görsün diye dinamik render edilir
+    response = measure(cook_client, 'GET', '/about', Budget(statements=3, rows=10, ms=50),
+                       'main.about:authenticated')
+    assert 'cook' in response.get_data(as_text=True)
+
+
+def test_testimonials(client, measure):
+    measure(client, 'GET', '/testimonials', Budget(statements=2, rows=70, ms=100), 'main.testimonials')
+
+
+def test_contact(client, measure):
+    measure(client, 'GET', '/contact', Budget(statements=0, rows=0, ms=50), 'main.contact')
+
+
+def test_sitemap_and_feeds_skip_orm(client, dataset, measure):
+    # İlk istek dosyaları üretir; sonrakiler diskten, hiç SQL çalıştırmadan
+    client.get('/sitemap.xml')
+    measure(client, 'GET', '/sitemap.xml', Budget(statements=0, rows=0, ms=50), 'main.sitemap')
+    measure(client, 'GET', '/sitemaps/recipes-0.xml', Budget(statements=0, rows=0, ms=50), 'main.sitemap_part')
+    measure(client, 'GET', '/feeds/latest.rss', Budget(statements=0, rows=0, ms=50), 'main.feed')
+    measure(client, 'GET', f'/feeds/category/{dataset.category_slug}.atom',
+            Budget(statements=0, rows=0, ms=50), 'main.feed:category')
+
+
+def test_unknown_url(client, measure):
+    measure(client, 'GET', '/yok-boyle-bir-sayfa', Budget(statements=1, rows=10, ms=50), 'not_found', status=404)
+
+
+def test_not_modified_keeps_weak_etag(client):
+    # Sıkıştırılmış 200 weak ETag taşır; aynı kaynağın 304'ü de aynı doğrulayıcıyı döndürmeli
+    headers = {'Accept-Encoding': 'gzip'}
+    response = client.get('/contact', headers=headers)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+    response = client.get('/contact', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
@@ -0,0 +1,63 @@
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import create_app
+from models import db, Comment, Recipe, User
+from schema import upgrade_schema
+
+# Önceki sürümün şeması: ON DELETE CASCADE, slug ve sonradan eklenen diğer sütunlar yok
+OLD_SCHEMA = """
+CREATE TABLE users (id INTEGER NOT NULL PRIMARY KEY, username VARCHAR(80) NOT NULL UNIQUE,
+    password_hash VARCHAR(255) NOT NULL, is_admin BOOLEAN, created_at DATETIME);
+CREATE TABLE categories (id INTEGER NOT NULL PRIMARY KEY, name VARCHAR(100) NOT NULL UNIQUE,
+    slug VARCHAR(100) NOT NULL UNIQUE, description TEXT, created_at DATETIME);
+CREATE TABLE recipes (id INTEGER NOT NULL PRIMARY KEY, title VARCHAR(200) NOT NULL, content TEXT NOT NULL,
+    category_id INTEGER NOT NULL REFERENCES categories (id),
+    user_id INTEGER NOT NULL REFERENCES users (id), created_at DATETIME, updated_at DATETIME);
+CREATE TABLE comments (id INTEGER NOT NULL PRIMARY KEY,
+    recipe_id INTEGER NOT NULL REFERENCES recipes (id), user_id INTEGER NOT NULL REFERENCES users (id),
+    body TEXT NOT NULL, rating INTEGER, created_at DATETIME);
+INSERT INTO users (id, username, password_hash) VALUES (1, 'cook', 'x'), (2, 'guest', 'x');
+INSERT INTO categories (id, name, slug) VALUES (1, 'Çorbalar', 'corbalar');
+INSERT INTO recipes (id, title, content, category_id, user_id) VALUES
+    (1, 'Mercimek Çorbası', '-', 1, 1), (2, 'Mercimek Çorbası', '-', 1, 2);
+INSERT INTO comments (recipe_id, user_id, body, rating) VALUES (1, 2, 'Güzel', 5), (1, 1, 'Teşekkürler', NULL);
+"""
+
+
+@pytest.fixture
+def old_app(tmp_path):
+    path = tmp_path / 'old.db'
+    with sqlite3.connect(path) as conn:
+        conn.executescript(OLD_SCHEMA)
+    return create_app({
+        'TESTING': True,
+        'SECRET_KEY': 'test',
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'FEEDS_FOLDER': str(tmp_path / 'feeds'),
+        'FEEDS_ASYNC': False,
+        'PRERENDER_FOLDER': str(tmp_path / 'pages'),
+        'ROUTING_VERSION_FILE': str(tmp_path / 'routing.version'),
+    })
+
+
+def test_upgrade_adds_cascade(old_app):
+    with old_app.app_context():
+        db.create_all()
+        changes = upgrade_schema()
+        assert 'comments foreign key ON DELETE kuralları güncellendi' in changes
+        assert '2 tarifin slug\'ı üretildi' in changes
+        assert upgrade_schema() == []  # ikinci çalıştırma bir şey yapmaz
+        assert [recipe.slug for recipe in Recipe.query.order_by(Recipe.id)] == \
+            ['mercimek-corbasi', 'mercimek-corbasi-2']
+        with pytest.raises(IntegrityError):
+            db.session.execute(Recipe.__table__.update().where(Recipe.id == 2).values(slug='mercimek-corbasi'))
+        db.session.rollback()
+
+        # foreign_keys=ON ile eski şemada IntegrityError verirdi
+        db.session.delete(db.session.get(User, 1))
+        db.session.commit()
+        assert db.session.query(Recipe).count() == 1
+        assert db.session.query(Comment).filter_by(recipe_id=1).count() == 0
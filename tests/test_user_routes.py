@@ -0,0 +1,128 @@
+import io
+import os
+import struct
+import zlib
+
+import pytest
+
+from conftest import Budget
+from models import db, Recipe
+
+
+@pytest.fixture
+def cook_recipe(app, dataset):
+    """Silme/düzenleme testleri için cook'a ait yeni tarif"""
+    with app.app_context():
+        recipe = Recipe(title='Geçici', content='Silinecek', category_id=dataset.category_id,
+                        user_id=dataset.cook_id)
+        db.session.add(recipe)
+        db.session.commit()
+        return recipe.id
+
+
+def test_my_recipes(cook_client, measure):
+    measure(cook_client, 'GET', '/my-recipes', Budget(statements=4, rows=60, ms=100), 'main.my_recipes')
+
+
+def test_add_recipe_form(cook_client, measure):
+    measure(cook_client, 'GET', '/recipe/add', Budget(statements=3, rows=20, ms=50), 'main.add_recipe')
+
+
+def test_add_recipe(cook_client, dataset, measure):
+    # Commit sonrası sitemap parçası ve akışların yeniden üretimi de dahil
+    measure(cook_client, 'POST', '/recipe/add', Budget(statements=9, rows=5, ms=300),
+            'main.add_recipe', status=302,
+            data={'title': 'Yeni Tarif', 'content': 'Açıklama', 'category_id': dataset.category_id})
+
+
+def png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def decompression_bomb():
+    """Birkaç byte'lık ama 30000x30000 piksel bildiren PNG"""
+    header = struct.pack('>IIBBBBB', 30000, 30000, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', header) + png_chunk(b'IEND', b'')
+
+
+def oversized_png(width=8000, height=6000):
+    """Geçerli, tek renk gri PNG: ~50 KB ama decode edilince width*height byte'tan fazla"""
+    compressor = zlib.compressobj(9)
+    row = bytes(width + 1)  # filtre byte'ı + satır
+    data = b''.join(compressor.compress(row) for _ in range(height)) + compressor.flush()
+    header = struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', header) + png_chunk(b'IDAT', data)
+            + png_chunk(b'IEND', b''))
+
+
+def test_add_recipe_rejects_decompression_bomb(cook_client, dataset, app):
+    # Açılamayan galeri görseli 500 vermez, atlanır ve diskte yetim dosya kalmaz
+    before = set(os.listdir(app.config['UPLOAD_FOLDER']))
+    response = cook_client.post('/recipe/add', data={
+        'title': 'Bombalı', 'content': 'x', 'category_id': dataset.category_id,
+        'images': (io.BytesIO(decompression_bomb()), 'bomba.png')})
+    assert response.status_code == 302
+    assert set(os.listdir(app.config['UPLOAD_FOLDER'])) == before
+    with app.app_context():
+        assert Recipe.query.filter_by(title='Bombalı').one().images == []
+
+
+def test_add_recipe_rejects_oversized_image(cook_client, dataset, app):
+    # Pillow'un bomba sınırının altında ama MAX_UPLOAD_PIXELS'in üstünde: decode edilmeden reddedilir
+    before = set(os.listdir(app.config['UPLOAD_FOLDER']))
+    response = cook_client.post('/recipe/add', data={
+        'title': 'Dev Görsel', 'content': 'x', 'category_id': dataset.category_id,
+        'images': (io.BytesIO(oversized_png()), 'dev.png')})
+    assert response.status_code == 302
+    assert set(os.listdir(app.config['UPLOAD_FOLDER'])) == before
+    with app.app_context():
+        assert Recipe.query.filter_by(title='Dev Görsel').one().images == []
+
+
+def test_edit_recipe_form(cook_client, dataset, measure):
+    measure(cook_client, 'GET', f'/recipe/{dataset.recipe_id}/edit', Budget(statements=5, rows=20, ms=50),
+            'main.edit_recipe')
+
+
+def test_edit_recipe(cook_client, dataset, measure):
+    measure(cook_client, 'POST', f'/recipe/{dataset.recipe_id}/edit', Budget(statements=10, rows=10, ms=300),
+            'main.edit_recipe', status=302,
+            data={'title': 'Güncel Tarif', 'content': 'Açıklama', 'category_id': dataset.category_id})
+
+
+def test_delete_recipe(cook_client, cook_recipe, measure):
+    measure(cook_client, 'POST', f'/recipe/{cook_recipe}/delete', Budget(statements=11, rows=5, ms=300),
+            'main.delete_recipe', status=302)
+
+
+def test_add_comment(cook_client, dataset, measure):
+    measure(cook_client, 'POST', f'/recipe/{dataset.other_recipe_id}/comment', Budget(statements=6, rows=5, ms=100),
+            'main.add_comment', status=302, data={'body': 'Harika olmuş', 'rating': 5})
+
+
+def test_add_comment_ajax(cook_client, dataset, measure):
+    response = measure(cook_client, 'POST', f'/recipe/{dataset.other_recipe_id}/comment',
+                       Budget(statements=6, rows=5, ms=100), 'main.add_comment:ajax', status=201,
+                       data={'body': 'Tekrar yaptım', 'rating': 4},
+                       headers={'X-Requested-With': 'XMLHttpRequest'})
+    assert 'data-comment-id' in response.get_data(as_text=True)
+
+
+def test_add_comment_rate_limited(cook_client, dataset, app, monkeypatch):
+    # Kullanıcı ve IP limitleri birlikte: IP'de reddedilen istek kullanıcı token'ını harcamaz
+    monkeypatch.setitem(app.config, 'RATELIMIT_ENABLED', True)
+    monkeypatch.setitem(app.config, 'RATELIMITS', {'main.add_comment:user': '2/minute',
+                                                   'main.add_comment:ip': '1/minute'})
+    path = f'/recipe/{dataset.other_recipe_id}/comment'
+
+    def post(ip):
+        return cook_client.post(path, data={'body': 'Sınır', 'rating': 4}, environ_base={'REMOTE_ADDR': ip})
+
+    assert post('10.9.0.1').status_code == 302
+    response = post('10.9.0.1')
+    assert response.status_code == 429
+    assert 0 < int(response.headers['Retry-After']) <= 60
+    assert post('10.9.0.2').status_code == 302
+    response = post('10.9.0.3')  # kullanıcının iki token'ı da bitti
+    assert response.status_code == 429
+    assert 'Retry-After' in response.headers